@@ -23,12 +23,20 @@ class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = RegisterSerializer
 
+def current_user(request):
+    """The signed-in user with profile and interest ids loaded for UserSerializer (two queries)."""
+    return (
+        User.objects.select_related("profile")
+        .prefetch_related("profile__interests")
+        .get(pk=request.user.pk)
+    )
+
 # Profile (get current user)
 class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(current_user(request))
         return Response({"user": serializer.data})
 
 # Update profile (partial)
@@ -37,7 +45,7 @@ class UpdateProfileView(generics.UpdateAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        return current_user(self.request)
 
 # Change password
 class ChangePasswordView(generics.UpdateAPIView):
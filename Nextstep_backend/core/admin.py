@@ -1,11 +1,14 @@
+from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from django.contrib import admin
 from .models import (
-    Tag, Skill, Career, Resource, Multimedia,
+    Tag, Skill, Career, Resource, Multimedia, MultimediaRating,
     SuccessStory, UserProfile, Feedback,
-    Quiz, QuizQuestion, QuizAttempt,
-    Interaction
+    Quiz, QuizQuestion, QuizSnapshot, QuizAttempt, QuizAnswer, QuizOptionMapping,
+    Interaction, InteractionDailyStat, AggregationWatermark,
+    ItemNeighbor, UserRecommendation, CohortAnswerStat
 )
+from .quiz_cache import get_snapshot_questions
 
 
 @admin.register(Tag)
@@ -59,7 +62,7 @@ class ResourceAdmin(admin.ModelAdmin):
 
 @admin.register(Multimedia)
 class MultimediaAdmin(admin.ModelAdmin):
-    list_display = ("title", "type", "rating_avg", "rating_count", "created_by", "created_at")
+    list_display = ("title", "type", "rating_avg", "rating_count", "views_count", "created_by", "created_at")
     list_filter = ("type", "created_at")
     search_fields = ("title", "transcript")
     readonly_fields = ("content_text",)
@@ -69,9 +72,16 @@ class MultimediaAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+@admin.register(MultimediaRating)
+class MultimediaRatingAdmin(admin.ModelAdmin):
+    list_display = ("multimedia", "user", "score", "updated_at")
+    list_filter = ("score", "updated_at")
+    search_fields = ("user__username", "multimedia__title")
+
+
 @admin.register(SuccessStory)
 class SuccessStoryAdmin(admin.ModelAdmin):
-    list_display = ("title", "domain", "submitted_by", "is_approved", "submitted_at")
+    list_display = ("title", "domain", "submitted_by", "is_approved", "views_count", "submitted_at")
     list_filter = ("is_approved", "domain", "submitted_at")
     search_fields = ("title", "story_text", "domain")
     readonly_fields = ("content_text",)
@@ -102,19 +112,26 @@ class QuizQuestionInline(admin.TabularInline):
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
-    list_display = ("title", "is_active", "created_at")
-    list_filter = ("is_active", "created_at")
+    list_display = ("title", "audience", "is_active", "selection_weight", "created_at")
+    list_filter = ("is_active", "audience", "created_at")
     search_fields = ("title", "description")
     inlines = [QuizQuestionInline]
 
 
+@admin.register(QuizSnapshot)
+class QuizSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("quiz", "content_hash", "created_at")
+    list_filter = ("quiz",)
+    readonly_fields = ("quiz", "content_hash", "questions", "created_at")
+
+
 @admin.register(QuizAttempt)
 class QuizAttemptAdmin(admin.ModelAdmin):
     list_display = ("user", "quiz", "started_at", "completed_at")
     list_filter = ("quiz", "started_at", "completed_at")
     search_fields = ("user__username",)
-    readonly_fields = ('user', 'quiz', 'started_at', 'completed_at', 'formatted_answers')
-    fields = ('user', 'quiz', 'started_at', 'completed_at', 'formatted_answers')
+    readonly_fields = ('user', 'quiz', 'snapshot', 'score', 'started_at', 'completed_at', 'formatted_answers')
+    fields = ('user', 'quiz', 'snapshot', 'score', 'started_at', 'completed_at', 'formatted_answers')
 
     def formatted_answers(self, obj):
         if not obj.answers:
@@ -142,20 +159,29 @@ class QuizAttemptAdmin(admin.ModelAdmin):
             <tbody>
         """
 
+        # question texts come from the attempt's snapshot (one cached lookup);
+        # older attempts without one fall back to a single in_bulk query
+        if obj.snapshot_id:
+            questions = get_snapshot_questions(obj.snapshot_id) or []
+            texts = {str(q["id"]): q["question_text"] for q in questions}
+        else:
+            ids = [q_id for q_id in obj.answers if str(q_id).isdigit()]
+            texts = {str(pk): q.question_text for pk, q in QuizQuestion.objects.in_bulk(ids).items()}
+
         for q_id, user_answer in obj.answers.items():
-            try:
-                question = QuizQuestion.objects.get(id=q_id)
+            question_text = texts.get(str(q_id))
+            if question_text is not None:
                 html += f"""
                 <tr>
-                    <td>{question.question_text}</td>
-                    <td>{user_answer}</td>
+                    <td>{escape(question_text)}</td>
+                    <td>{escape(user_answer)}</td>
                 </tr>
                 """
-            except QuizQuestion.DoesNotExist:
+            else:
                 html += f"""
                 <tr>
-                    <td>Question ID {q_id} (not found)</td>
-                    <td>{user_answer}</td>
+                    <td>Question ID {escape(q_id)} (not found)</td>
+                    <td>{escape(user_answer)}</td>
                 </tr>
                 """
         
@@ -164,9 +190,59 @@ class QuizAttemptAdmin(admin.ModelAdmin):
     formatted_answers.short_description = "Questions and Answers"
 
 
+@admin.register(QuizAnswer)
+class QuizAnswerAdmin(admin.ModelAdmin):
+    list_display = ("attempt", "question", "option")
+    list_filter = ("question__quiz",)
+    search_fields = ("option",)
+    raw_id_fields = ("attempt", "question")
+
+
+@admin.register(QuizOptionMapping)
+class QuizOptionMappingAdmin(admin.ModelAdmin):
+    list_display = ("question", "option", "weight")
+    list_filter = ("question__quiz",)
+    search_fields = ("option", "message")
+    raw_id_fields = ("question",)
+
+
 @admin.register(Interaction)
 class InteractionAdmin(admin.ModelAdmin):
     list_display = ("user", "interaction_type", "content_type", "object_id", "created_at")
     list_filter = ("interaction_type", "created_at", "content_type")
     search_fields = ("user__username", "metadata")
     readonly_fields = ("created_at",)
+
+
+
+@admin.register(InteractionDailyStat)
+class InteractionDailyStatAdmin(admin.ModelAdmin):
+    list_display = ("day", "content_type", "object_id", "interaction_type", "count")
+    list_filter = ("interaction_type", "content_type", "day")
+    readonly_fields = ("day", "content_type", "object_id", "interaction_type", "count")
+
+
+@admin.register(AggregationWatermark)
+class AggregationWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_id", "updated_at")
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(ItemNeighbor)
+class ItemNeighborAdmin(admin.ModelAdmin):
+    list_display = ("content_type", "object_id", "rank", "neighbor_content_type", "neighbor_object_id", "score")
+    list_filter = ("content_type",)
+
+
+@admin.register(UserRecommendation)
+class UserRecommendationAdmin(admin.ModelAdmin):
+    list_display = ("user", "rank", "content_type", "object_id", "score")
+    list_filter = ("content_type",)
+    search_fields = ("user__username",)
+
+
+@admin.register(CohortAnswerStat)
+class CohortAnswerStatAdmin(admin.ModelAdmin):
+    list_display = ("week", "quiz", "question", "option", "role", "education_level", "count")
+    list_filter = ("quiz", "role", "education_level", "week")
+    raw_id_fields = ("question",)
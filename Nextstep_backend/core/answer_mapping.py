@@ -0,0 +1,198 @@
+# core/answer_mapping.py
+"""
+Rules-based answer -> career mapping.
+
+compile_question_mappings() turns the answersMapping blocks of the
+careerData.json questions (streamed one at a time) into QuizOptionMapping
+rows, one per (question, option). Career and resource names are resolved to
+Career / Resource ids where a row with that title exists, and an option's
+industries are the question's industries named in its message plus the
+domains of the careers it matched.
+
+score_answers() combines a user's answers through a per-quiz index kept in
+process memory for the current quiz version, summing option weights per
+career, industry and resource. A warm index answers without any query.
+"""
+from functools import lru_cache
+
+from django.db import transaction
+
+from .json_stream import batched
+from .models import Career, Quiz, QuizAnswer, QuizOptionMapping, QuizQuestion, Resource
+from .quiz_cache import bump_quiz_version, quiz_version
+from .scoring import _option_lookup
+
+MAPPING_FIELDS = ("message", "weight", "careers", "industries", "resources")
+
+
+def normalize_text(text):
+    return " ".join(str(text).split()).lower()
+
+
+def _unique(values):
+    return list(dict.fromkeys(v for v in values if v))
+
+
+def _question_candidates():
+    """{normalized question text: [(question_id, quiz_id, audience, options)]}"""
+    candidates = {}
+    for qid, quiz_id, audience, text, options in QuizQuestion.objects.values_list(
+        "id", "quiz_id", "quiz__audience", "question_text", "options"
+    ):
+        candidates.setdefault(normalize_text(text), []).append((qid, quiz_id, audience, options))
+    return candidates
+
+
+def _wanted_rows(batch, candidates, careers, resources):
+    """Target field values per (question_id, option) for a batch of (audience, question dict)."""
+    wanted = {}      # (question_id, option) -> field values
+    quiz_of = {}     # question_id -> quiz_id
+    for audience, q in batch:
+        text = q.get("question") or q.get("question_text") or q.get("questionText")
+        answers_map = q.get("answersMapping")
+        if not text or not isinstance(answers_map, dict):
+            continue
+        matches = candidates.get(normalize_text(text), [])
+        # the same text may exist in several audience quizzes; prefer the matching one
+        same_audience = [m for m in matches if m[2] == str(audience).lower()]
+        for qid, quiz_id, _, options in same_audience or matches:
+            quiz_of[qid] = quiz_id
+            labels = {normalize_text(o): str(o) for o in options or [] if not isinstance(o, dict)}
+            for option_text, mapping in answers_map.items():
+                if not isinstance(mapping, dict):
+                    continue
+                message = mapping.get("message") or ""
+                matched = [(name, careers.get(normalize_text(name))) for name in mapping.get("careers") or []]
+                industries = [i for i in q.get("industries") or [] if normalize_text(i) in normalize_text(message)]
+                industries += [hit[1] for _, hit in matched if hit]
+                option = labels.get(normalize_text(option_text), str(option_text))[:255]
+                wanted[(qid, option)] = {
+                    "message": message,
+                    "weight": float(mapping.get("weight") or 1),
+                    "careers": [{"name": name, "id": hit[0] if hit else None} for name, hit in matched],
+                    "industries": _unique(industries),
+                    "resources": [
+                        {
+                            "type": r.get("type") or "",
+                            "title": r.get("title") or "",
+                            "url": r.get("url") or "",
+                            "id": resources.get(normalize_text(r.get("title") or "")),
+                        }
+                        for r in mapping.get("followUpResources") or []
+                        if isinstance(r, dict)
+                    ],
+                }
+    return wanted, quiz_of
+
+
+def compile_question_mappings(records, batch_size=500):
+    """
+    Sync QuizOptionMapping from an iterable of (audience, question dict), batch by batch.
+    Returns (created, updated, deleted) row counts.
+    """
+    candidates = _question_candidates()
+    careers = {}
+    for pk, title, domain in Career.objects.values_list("id", "title", "domain"):
+        careers.setdefault(normalize_text(title), (pk, domain))
+    resources = {}
+    for pk, title in Resource.objects.values_list("id", "title"):
+        resources.setdefault(normalize_text(title), pk)
+
+    created = updated = deleted = 0
+    changed_quizzes = set()
+    with transaction.atomic():
+        for batch in batched(records, batch_size):
+            wanted, quiz_of = _wanted_rows(batch, candidates, careers, resources)
+            existing = {
+                (m.question_id, m.option): m
+                for m in QuizOptionMapping.objects.select_for_update().filter(question_id__in=quiz_of)
+            }
+            to_create, to_update = [], []
+            for key, values in wanted.items():
+                row = existing.pop(key, None)
+                if row is None:
+                    to_create.append(QuizOptionMapping(question_id=key[0], option=key[1], **values))
+                elif any(getattr(row, f) != v for f, v in values.items()):
+                    for f, v in values.items():
+                        setattr(row, f, v)
+                    to_update.append(row)
+                else:
+                    continue
+                changed_quizzes.add(quiz_of[key[0]])
+            # options that disappeared from the mapping
+            stale = [m.pk for m in existing.values()]
+            changed_quizzes.update(quiz_of[m.question_id] for m in existing.values())
+
+            QuizOptionMapping.objects.bulk_create(to_create, batch_size=batch_size)
+            QuizOptionMapping.objects.bulk_update(to_update, MAPPING_FIELDS, batch_size=batch_size)
+            QuizOptionMapping.objects.filter(pk__in=stale).delete()
+            created, updated, deleted = created + len(to_create), updated + len(to_update), deleted + len(stale)
+        for quiz_id in changed_quizzes:
+            bump_quiz_version(quiz_id)
+    return created, updated, deleted
+
+
+def build_index(quiz_id):
+    """
+    {question_id (str): (option lookup, [mapping dict or None per option])} for a quiz,
+    or None if the quiz does not exist.
+    """
+    if not Quiz.objects.filter(pk=quiz_id).exists():
+        return None
+    rows = {}
+    for row in QuizOptionMapping.objects.filter(question__quiz_id=quiz_id).values("question_id", "option", *MAPPING_FIELDS):
+        rows.setdefault(row["question_id"], {})[normalize_text(row["option"])] = row
+    index = {}
+    for qid, options in QuizQuestion.objects.filter(quiz_id=quiz_id).values_list("id", "options"):
+        if not isinstance(options, list):
+            continue
+        mapped = rows.get(qid, {})
+        entries = [mapped.get(normalize_text(o.get("text", "") if isinstance(o, dict) else o)) for o in options]
+        index[str(qid)] = (_option_lookup(options), entries)
+    return index
+
+
+@lru_cache(maxsize=64)
+def _index(quiz_id, version):
+    return build_index(quiz_id)
+
+
+def index_for_quiz(quiz_id):
+    """Mapping index for the current version of the quiz (None if it does not exist)."""
+    return _index(quiz_id, quiz_version(quiz_id))
+
+
+def _ranked(scores, top):
+    # dicts keep first-seen order, so ties go to the earlier answer
+    ranked = sorted(scores.values(), key=lambda item: -item["score"])
+    return ranked[:top]
+
+
+def score_answers(index, answers, top=5):
+    """Rank careers, industries and follow-up resources for {"question_id": option} answers."""
+    careers, industries, resources, messages = {}, {}, {}, []
+    for qid, value in (answers or {}).items():
+        question = index.get(str(qid))
+        if question is None:
+            continue
+        lookup, entries = question
+        for option in QuizAnswer.normalize(value):
+            o = lookup.get(option.lower())
+            entry = entries[o] if o is not None else None
+            if entry is None:
+                continue
+            weight = entry["weight"]
+            if entry["message"]:
+                messages.append(entry["message"])
+            for career in entry["careers"]:
+                careers.setdefault(career["name"], {**career, "score": 0.0})["score"] += weight
+            for industry in entry["industries"]:
+                industries.setdefault(industry, {"name": industry, "score": 0.0})["score"] += weight
+            for resource in entry["resources"]:
+                resources.setdefault((resource["type"], resource["title"]), {**resource, "score": 0.0})["score"] += weight
+    return {
+        "careers": _ranked(careers, top),
+        "industries": _ranked(industries, top),
+        "resources": _ranked(resources, top),
+        "messages": messages,
+    }
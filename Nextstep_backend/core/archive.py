@@ -0,0 +1,85 @@
+# core/archive.py
+"""
+Cold storage for Interaction rows.
+
+Archived rows live under `<root>/month=YYYY-MM/type=<interaction_type>/part-*.jsonl.gz`,
+one JSON object per line. The archive_interactions command writes them; the
+readers below load them back for offline analysis.
+"""
+import glob
+import gzip
+import json
+import os
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+ARCHIVE_FIELDS = ("id", "user_id", "content_type_id", "object_id", "interaction_type", "metadata", "created_at")
+
+
+def default_archive_root():
+    return getattr(settings, "INTERACTION_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "archive", "interactions"))
+
+
+def partition_dir(root, month, interaction_type):
+    return os.path.join(root, f"month={month}", f"type={interaction_type}")
+
+
+class PartitionedWriter:
+    """
+    Streams rows into one gzip JSONL file per (month, interaction_type) partition.
+    Files are only visible under their final name once close() succeeds.
+    """
+
+    def __init__(self, root, part_name):
+        self.root = root
+        self.part_name = part_name
+        self._files = {}
+        self.counts = {}
+
+    def write(self, row):
+        month = row["created_at"].strftime("%Y-%m")
+        key = (month, row["interaction_type"])
+        fh = self._files.get(key)
+        if fh is None:
+            directory = partition_dir(self.root, *key)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{self.part_name}.jsonl.gz")
+            fh = gzip.open(path + ".tmp", "wt", encoding="utf-8")
+            self._files[key] = fh
+        fh.write(json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")))
+        fh.write("\n")
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def close(self):
+        for fh in self._files.values():
+            fh.close()
+            os.replace(fh.name, fh.name[: -len(".tmp")])
+        self._files = {}
+
+    def abort(self):
+        for fh in self._files.values():
+            fh.close()
+            os.remove(fh.name)
+        self._files = {}
+
+
+def list_partitions(root=None, month=None, interaction_type=None):
+    """Return the archive files matching the optional month ("YYYY-MM") / type filters."""
+    root = root or default_archive_root()
+    pattern = os.path.join(
+        root,
+        f"month={month or '*'}",
+        f"type={interaction_type or '*'}",
+        "*.jsonl.gz",
+    )
+    return sorted(glob.glob(pattern))
+
+
+def iter_archived_interactions(root=None, month=None, interaction_type=None):
+    """Yield archived interactions as dicts, one partition file at a time."""
+    for path in list_partitions(root, month, interaction_type):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
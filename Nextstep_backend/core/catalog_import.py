@@ -0,0 +1,274 @@
+# core/catalog_import.py
+"""
+Bulk upsert of the careerData.json catalog (careerBank, resourceLibrary,
+multimediaGuidance, successStories) into Career, Resource, Multimedia and
+SuccessStory.
+
+Each section names the JSON arrays it reads (a key path for
+json_stream.iter_records), so a file is streamed one element at a time.
+Rows are matched on a natural key (title, plus type for multimedia) and
+processed in fixed-size batches. Per batch, Tag / Skill names are resolved
+with one query (missing ones are bulk-created with ignore_conflicts), the
+existing rows and their M2M links are loaded with one query each, and only
+rows whose fields or links changed are written: bulk_create / bulk_update
+for the rows and bulk_create / delete on the through tables for the links.
+content_text is built in the same pass from the resolved names, so an
+unchanged file costs a few SELECTs per section and no writes.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .json_stream import batched
+from .models import Career, Multimedia, Resource, SuccessStory, Skill, Tag
+from .versions import bump_model_versions
+
+RESOURCE_CATEGORIES = {"articles": "guide", "ebooks": "pdf", "webinars": "slides"}
+MULTIMEDIA_TYPES = {"videos": "video", "podcasts": "audio"}
+
+
+def _salary(value):
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", str(value or ""))
+    if not match:
+        return None
+    try:
+        return Decimal(match.group(0).replace(",", ""))
+    except InvalidOperation:
+        return None
+
+
+def _url(value):
+    return value if isinstance(value, str) and value.startswith(("http://", "https://")) else None
+
+
+def resolve_tags(names):
+    """{name: Tag} for the given names; tags are matched on slug so "Technology" reuses "technology"."""
+    slugs = {name: slugify(name)[:100] for name in names if name and slugify(name)}
+    found = {t.slug: t for t in Tag.objects.filter(slug__in=set(slugs.values()))}
+    missing = {slug: name for name, slug in slugs.items() if slug not in found}
+    if missing:
+        Tag.objects.bulk_create([Tag(name=name[:80], slug=slug) for slug, name in missing.items()], ignore_conflicts=True)
+        bump_model_versions(Tag)
+        found.update((t.slug, t) for t in Tag.objects.filter(slug__in=list(missing)))
+    return {name: found[slug] for name, slug in slugs.items() if slug in found}
+
+
+def resolve_skills(names):
+    names = {n[:120] for n in names if n}
+    found = {s.name: s for s in Skill.objects.filter(name__in=names)}
+    missing = names - found.keys()
+    if missing:
+        Skill.objects.bulk_create([Skill(name=n) for n in missing], ignore_conflicts=True)
+        bump_model_versions(Skill)
+        found.update((s.name, s) for s in Skill.objects.filter(name__in=missing))
+    return found
+
+
+class Section:
+    """How one JSON section maps onto a model."""
+
+    def __init__(self, model, key, fields, path, row, m2m=None, create_defaults=None):
+        self.model = model
+        self.key = key                          # natural key fields
+        self.fields = fields                    # fields owned by the file (excluding content_text)
+        self.path = path                        # iter_records path of the section's arrays
+        self.row = row                          # (keys, element) -> {"values": {...}, "<m2m field>": [names]} or None
+        self.m2m = m2m or {}                    # {m2m field: (build_content_text kwarg, resolver)}
+        self.create_defaults = create_defaults or (lambda: {})
+
+    def rows(self, records):
+        """Rows for the (keys, element) pairs read at self.path; invalid elements are skipped."""
+        for keys, item in records:
+            row = self.row(keys, item) if isinstance(item, dict) else None
+            if row is not None:
+                yield row
+
+
+def _career_row(keys, c):
+    if not c.get("careerName"):
+        return None
+    return {
+        "values": {
+            "title": c["careerName"][:255],
+            "domain": (c.get("industry") or "")[:120] or None,
+            "description": c.get("description") or "",
+            "education_path": c.get("educationPath") or "",
+            "expected_salary": _salary(c.get("averageSalary")),
+        },
+        "tags": [c["industry"]] if c.get("industry") else [],
+        "required_skills": c.get("skillsRequired") or [],
+    }
+
+
+def _resource_row(keys, r):
+    if not r.get("title"):
+        return None
+    return {
+        "values": {
+            "title": r["title"][:255],
+            "category": RESOURCE_CATEGORIES.get(keys[1], "other"),
+            "description": r.get("description") or "",
+        },
+        "tags": [r["type"]] if r.get("type") else [],
+    }
+
+
+def _multimedia_row(keys, m):
+    if not m.get("title"):
+        return None
+    return {
+        "values": {
+            "title": m["title"][:255],
+            "type": MULTIMEDIA_TYPES.get(keys[1], "other"),
+            "url": _url(m.get("url")),
+            "transcript": m.get("transcript") or "",
+        },
+        "tags": [m["category"]] if m.get("category") else [],
+    }
+
+
+def _story_row(keys, s):
+    if not s.get("name") or not s.get("story"):
+        return None
+    return {
+        "values": {
+            "title": s["name"][:255],
+            "domain": (s.get("domain") or "")[:120] or None,
+            "story_text": s["story"],
+        },
+    }
+
+
+SECTIONS = {
+    "careerBank": Section(
+        Career, ("title",), ("domain", "description", "education_path", "expected_salary"),
+        ("careerBank",), _career_row,
+        m2m={"tags": ("tag_names", resolve_tags), "required_skills": ("skill_names", resolve_skills)},
+    ),
+    "resourceLibrary": Section(
+        Resource, ("title",), ("category", "description"), ("resourceLibrary", "*"), _resource_row,
+        m2m={"tags": ("tag_names", resolve_tags)},
+    ),
+    "multimediaGuidance": Section(
+        Multimedia, ("title", "type"), ("url", "transcript"), ("multimediaGuidance", "*"), _multimedia_row,
+        m2m={"tags": ("tag_names", resolve_tags)},
+    ),
+    "successStories": Section(
+        SuccessStory, ("title",), ("domain", "story_text"), ("successStories",), _story_row,
+        # seeded stories are curated content, so they are published right away
+        create_defaults=lambda: {"is_approved": True, "approved_at": timezone.now()},
+    ),
+}
+
+
+class SectionResult:
+    def __init__(self, name):
+        self.name = name
+        self.created = self.updated = self.unchanged = 0
+        self.links_added = self.links_removed = 0
+
+    def __str__(self):
+        return (
+            f"{self.name}: {self.created} created, {self.updated} updated, {self.unchanged} unchanged; "
+            f"links +{self.links_added} -{self.links_removed}"
+        )
+
+
+def _upsert_batch(section, batch, result):
+    model = section.model
+    owned = section.key + section.fields + ("content_text",)
+
+    resolved = {}
+    for field, (_, resolver) in section.m2m.items():
+        resolved[field] = resolver({name for row in batch for name in row.get(field, [])})
+
+    first_key = section.key[0]
+    existing = {
+        tuple(row[k] for k in section.key): row
+        for row in model.objects.filter(**{f"{first_key}__in": {r["values"][first_key] for r in batch}}).values("pk", *owned)
+    }
+
+    links = {}
+    for field in section.m2m:
+        descriptor = model._meta.get_field(field)
+        source, target = descriptor.m2m_column_name(), descriptor.m2m_reverse_name()
+        current = {}
+        for pk, owner, other in descriptor.remote_field.through.objects.filter(
+            **{f"{source}__in": [row["pk"] for row in existing.values()]}
+        ).values_list("pk", source, target):
+            current.setdefault(owner, {})[other] = pk
+        links[field] = (descriptor.remote_field.through, source, target, current)
+
+    to_create, to_update, wanted_links, seen = [], [], [], set()
+    for row in batch:
+        values = dict(row["values"])
+        key = tuple(values[k] for k in section.key)
+        if key in seen:
+            continue
+        seen.add(key)
+        targets = {
+            field: [resolved[field][n] for n in dict.fromkeys(row.get(field, [])) if n in resolved[field]]
+            for field in section.m2m
+        }
+        obj = model(**values)
+        obj.build_content_text(**{kwarg: [t.name for t in targets[field]] for field, (kwarg, _) in section.m2m.items()})
+        values["content_text"] = obj.content_text
+
+        current = existing.get(key)
+        if current is None:
+            for name, value in section.create_defaults().items():
+                setattr(obj, name, value)
+            to_create.append(obj)
+        else:
+            obj.pk = current["pk"]
+            if any(current[f] != values[f] for f in owned):
+                to_update.append(obj)
+            else:
+                result.unchanged += 1
+        wanted_links.append((obj, targets))
+
+    model.objects.bulk_create(to_create)
+    if to_update:
+        model.objects.bulk_update(to_update, section.fields + ("content_text",))
+    result.created += len(to_create)
+    result.updated += len(to_update)
+    changed = bool(to_create or to_update)
+
+    for field, (through, source, target, current) in links.items():
+        add, remove = [], []
+        for obj, targets in wanted_links:
+            have = current.get(obj.pk, {})
+            want = {t.pk for t in targets[field]}
+            add += [through(**{source: obj.pk, target: t}) for t in want - have.keys()]
+            remove += [pk for other, pk in have.items() if other not in want]
+        if add:
+            through.objects.bulk_create(add, ignore_conflicts=True)
+        if remove:
+            through.objects.filter(pk__in=remove).delete()
+        result.links_added += len(add)
+        result.links_removed += len(remove)
+        changed = changed or bool(add or remove)
+
+    # bulk writes send no signals, so mark the model changed for conditional GETs
+    if changed:
+        bump_model_versions(model)
+
+
+def import_catalog(read, sections=None, batch_size=500):
+    """
+    Upsert the selected sections (all by default) of careerData.json; returns [SectionResult].
+    read(path) yields the (keys, element) pairs at a key path, like json_stream.iter_records.
+    """
+    results = []
+    with transaction.atomic():
+        for name, section in SECTIONS.items():
+            if sections and name not in sections:
+                continue
+            result = SectionResult(name)
+            for batch in batched(section.rows(read(section.path)), batch_size):
+                _upsert_batch(section, batch, result)
+            results.append(result)
+    return results
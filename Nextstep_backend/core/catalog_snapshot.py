@@ -0,0 +1,239 @@
+# core/catalog_snapshot.py
+"""
+Streaming snapshot of the content catalog, for moving it between environments.
+
+dump_catalog() yields one JSON document per line: a header, then every row of
+CATALOG_MODELS in dependency order, in the shape Django's serializers use
+
+    {"model": "core.career", "pk": 3, "fields": {..., "tags": [1, 2], "required_skills": [4]}}
+
+Rows are read with values().iterator(), so nothing is materialized beyond one
+chunk, and the M2M ids of a chunk are fetched with one query per relation.
+
+restore_catalog() reads such lines back in batches and upserts rows on their
+primary key (bulk_create with update_conflicts), then replaces the batch's
+M2M links with one delete and one bulk insert per relation. Tags and skills
+are matched on their unique names first (NATURAL_KEYS), so a database seeded
+by populate_tags / populate_catalog under other ids keeps its rows and the
+snapshot's links are pointed at them. Everything runs in one transaction. Foreign keys to users are not part of a snapshot and
+are left empty on restore; file fields carry their stored path only.
+"""
+import json
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .json_stream import batched
+from .models import Career, Multimedia, Quiz, QuizQuestion, Resource, Skill, SuccessStory, Tag
+from .quiz_cache import bump_quiz_version, invalidate_random_index
+from .versions import bump_model_versions
+
+FORMAT = "nextstep-catalog"
+VERSION = 1
+
+# dependency order: referenced models come first
+CATALOG_MODELS = (Tag, Skill, Career, Resource, Multimedia, SuccessStory, Quiz, QuizQuestion)
+# unique columns a restored row is matched on before its primary key, in order
+NATURAL_KEYS = {Tag: ("slug", "name"), Skill: ("name",)}
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _is_user_fk(field):
+    return field.is_relation and field.related_model is not None and (
+        field.related_model._meta.label == settings.AUTH_USER_MODEL
+    )
+
+
+def _fields(model):
+    """Concrete non-pk fields that travel with a snapshot."""
+    return [f for f in model._meta.concrete_fields if not f.primary_key and not _is_user_fk(f)]
+
+
+def _m2m(model):
+    return [f for f in model._meta.many_to_many if f.related_model in CATALOG_MODELS]
+
+
+def _links(field, pks):
+    """{owner pk: [target pks]} for one M2M relation."""
+    through = field.remote_field.through
+    source, target = field.m2m_column_name(), field.m2m_reverse_name()
+    links = {}
+    for owner, other in through.objects.filter(**{f"{source}__in": pks}).order_by(source, target).values_list(source, target):
+        links.setdefault(owner, []).append(other)
+    return links
+
+
+def dump_catalog(chunk_size=2000, counts=None):
+    """Yield the snapshot as JSON lines (without trailing newlines); rows per model go into `counts`."""
+    yield json.dumps({"format": FORMAT, "version": VERSION, "models": [_label(m) for m in CATALOG_MODELS]})
+    for model in CATALOG_MODELS:
+        fields, m2m = _fields(model), _m2m(model)
+        rows = model._default_manager.order_by("pk").values("pk", *[f.attname for f in fields]).iterator(chunk_size=chunk_size)
+        for chunk in batched(rows, chunk_size):
+            pks = [row["pk"] for row in chunk]
+            links = {f.name: _links(f, pks) for f in m2m}
+            for row in chunk:
+                data = {f.name: row[f.attname] for f in fields}
+                for name, by_owner in links.items():
+                    data[name] = by_owner.get(row["pk"], [])
+                yield json.dumps(
+                    {"model": _label(model), "pk": row["pk"], "fields": data},
+                    cls=DjangoJSONEncoder, separators=(",", ":"),
+                )
+            if counts is not None:
+                counts[_label(model)] = counts.get(_label(model), 0) + len(chunk)
+
+
+class RestoreResult:
+    def __init__(self):
+        self.rows = {}
+        self.links = {}
+        self.matched = {}
+        # {model: {snapshot pk: pk in this database}} for rows that landed under another id
+        self.remapped = {}
+
+    def __str__(self):
+        parts = []
+        for label, n in self.rows.items():
+            part = f"{label}: {n} rows, {self.links.get(label, 0)} links"
+            if self.matched.get(label):
+                part += f" ({self.matched[label]} matched to existing rows)"
+            parts.append(part)
+        return ", ".join(parts)
+
+
+def _timestamp_fields(fields):
+    return [f for f in fields if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)]
+
+
+def _reset_sequences(models):
+    # explicit primary keys leave sequences behind on some backends
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), list(models)):
+            cursor.execute(sql)
+
+
+def _match_natural_keys(model, objs):
+    """
+    Move objs onto existing rows with the same natural key; rows new to this
+    database keep their snapshot pk unless another row holds it, in which case
+    they are returned to be inserted under a fresh id.
+    """
+    unmatched, matched = list(objs), 0
+    for key in NATURAL_KEYS.get(model, ()):
+        existing = dict(
+            model._default_manager.filter(**{f"{key}__in": [getattr(o, key) for o in unmatched]}).values_list(key, "pk")
+        )
+        rest = []
+        for obj in unmatched:
+            pk = existing.get(getattr(obj, key))
+            if pk is None:
+                rest.append(obj)
+            else:
+                obj.pk, matched = pk, matched + 1
+        unmatched = rest
+    if model not in NATURAL_KEYS:
+        return [], matched
+    seen = set()
+    for obj in objs:
+        if obj.pk in seen:
+            raise ValueError(f"Two {model._meta.verbose_name_plural} in the snapshot match the existing row {obj.pk}")
+        seen.add(obj.pk)
+    taken = set(model._default_manager.filter(pk__in=[o.pk for o in unmatched]).values_list("pk", flat=True))
+    fresh = [obj for obj in unmatched if obj.pk in taken]
+    for obj in fresh:
+        obj.pk = None
+    return fresh, matched
+
+
+def _restore_batch(model, records, result):
+    fields, m2m = _fields(model), _m2m(model)
+    objs, wanted_links = [], {f.name: [] for f in m2m}
+    for record in records:
+        data = record["fields"]
+        obj = model(pk=record["pk"])
+        for f in fields:
+            if f.name in data:
+                setattr(obj, f.attname, f.to_python(data[f.name]))
+        objs.append(obj)
+        for f in m2m:
+            remap = result.remapped.get(f.related_model, {})
+            wanted_links[f.name] += [(obj, remap.get(target, target)) for target in data.get(f.name) or []]
+
+    snapshot_pks = [obj.pk for obj in objs]
+    fresh, matched = _match_natural_keys(model, objs)
+    update_fields = [f.name for f in fields]
+    timestamps = _timestamp_fields(fields)
+    kept = [[getattr(obj, f.attname) for f in timestamps] for obj in objs]
+    model._default_manager.bulk_create(
+        [obj for obj in objs if obj.pk is not None],
+        update_conflicts=bool(update_fields), unique_fields=[model._meta.pk.name], update_fields=update_fields or None,
+    )
+    if fresh:
+        _reset_sequences([model])
+        for obj in fresh:
+            obj.save(force_insert=True)
+    remap = result.remapped.setdefault(model, {})
+    for snapshot_pk, obj in zip(snapshot_pks, objs):
+        if obj.pk != snapshot_pk:
+            remap[snapshot_pk] = obj.pk
+    # auto_now / auto_now_add are overwritten on insert; put the snapshot's values back
+    if timestamps:
+        for obj, values in zip(objs, kept):
+            for f, value in zip(timestamps, values):
+                setattr(obj, f.attname, value)
+        model._default_manager.bulk_update(objs, [f.name for f in timestamps])
+
+    label = _label(model)
+    result.rows[label] = result.rows.get(label, 0) + len(objs)
+    result.matched[label] = result.matched.get(label, 0) + matched
+    pks = [obj.pk for obj in objs]
+    for f in m2m:
+        through = f.remote_field.through
+        source, target = f.m2m_column_name(), f.m2m_reverse_name()
+        through.objects.filter(**{f"{source}__in": pks}).delete()
+        through.objects.bulk_create([through(**{source: a.pk, target: b}) for a, b in wanted_links[f.name]], ignore_conflicts=True)
+        result.links[label] = result.links.get(label, 0) + len(wanted_links[f.name])
+
+
+def restore_catalog(lines, batch_size=1000):
+    """Upsert a snapshot produced by dump_catalog(); `lines` is any iterable of JSON lines."""
+    models_by_label = {_label(m): m for m in CATALOG_MODELS}
+    records = (json.loads(line) for line in lines if line.strip())
+    header = next(records, None)
+    if not header or header.get("format") != FORMAT:
+        raise ValueError("Not a catalog snapshot")
+    if header.get("version", 0) > VERSION:
+        raise ValueError(f"Snapshot version {header['version']} is newer than supported ({VERSION})")
+
+    result = RestoreResult()
+    with transaction.atomic():
+        model, batch = None, []
+        for record in records:
+            current = models_by_label.get(record.get("model"))
+            if current is None:
+                raise ValueError(f"Unknown model in snapshot: {record.get('model')}")
+            if batch and (current is not model or len(batch) >= batch_size):
+                _restore_batch(model, batch, result)
+                batch = []
+            model = current
+            batch.append(record)
+        if batch:
+            _restore_batch(model, batch, result)
+
+        _reset_sequences(CATALOG_MODELS)
+
+        # bulk writes skip the post_save handlers that keep the quiz cache and model versions fresh
+        restored = [m for m in CATALOG_MODELS if result.rows.get(_label(m))]
+        if restored:
+            bump_model_versions(*restored)
+        if result.rows.get(_label(Quiz)) or result.rows.get(_label(QuizQuestion)):
+            for quiz_id in Quiz.objects.values_list("pk", flat=True).iterator():
+                bump_quiz_version(quiz_id)
+            invalidate_random_index()
+    return result
@@ -0,0 +1,84 @@
+# core/cohorts.py
+"""
+Quiz answer counts by cohort: (quiz, question, option, role, education_level, week).
+
+New QuizAnswer rows are folded into CohortAnswerStat past an id watermark by
+the rollup_quiz_cohorts command. When an attempt's answers are re-submitted
+its already-folded rows are retracted first, so the cube does not double
+count; deleting an attempt (directly or by cascade) retracts it as well.
+Cohort dimensions are stored on each QuizAnswer row when the attempt is
+submitted, so a later profile change cannot move a retraction to another cell.
+Rebuilding the answer rows gives them new ids, so it clears the cube too.
+"""
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import AggregationWatermark, CohortAnswerStat, QuizAnswer
+
+WATERMARK_NAME = "cohort_answer_stat"
+
+DIMENSIONS = ("quiz_id", "question_id", "option", "role", "education_level", "week")
+
+
+def _grouped(answers):
+    """GROUP BY the cube dimensions over a QuizAnswer queryset."""
+    return (
+        answers.annotate(cube_quiz_id=F("question__quiz_id"))
+        .values("cube_quiz_id", "question_id", "option", "role", "education_level", "week")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+
+
+def _apply(deltas):
+    """Add {dimension tuple: delta} onto the cube (rows are created on first sight)."""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return 0
+    question_ids = {k[1] for k in deltas}
+    weeks = {k[5] for k in deltas}
+    existing = {
+        tuple(getattr(s, d) for d in DIMENSIONS): s
+        for s in CohortAnswerStat.objects.select_for_update().filter(question_id__in=question_ids, week__in=weeks)
+    }
+    to_update, to_create = [], []
+    for key, n in deltas.items():
+        stat = existing.get(key)
+        if stat is not None:
+            stat.count = max(stat.count + n, 0)
+            to_update.append(stat)
+        elif n > 0:
+            to_create.append(CohortAnswerStat(count=n, **dict(zip(DIMENSIONS, key))))
+    if to_update:
+        CohortAnswerStat.objects.bulk_update(to_update, ["count"], batch_size=1000)
+    if to_create:
+        CohortAnswerStat.objects.bulk_create(to_create, batch_size=1000)
+    return len(deltas)
+
+
+def _deltas(answers, sign=1):
+    return {
+        (g["cube_quiz_id"], g["question_id"], g["option"], g["role"], g["education_level"], g["week"]): sign * g["n"]
+        for g in _grouped(answers)
+    }
+
+
+def fold_range(start, end):
+    """Fold QuizAnswer rows with start < id <= end; returns (answers, cube cells touched)."""
+    deltas = _deltas(QuizAnswer.objects.filter(id__gt=start, id__lte=end))
+    return sum(deltas.values()), _apply(deltas)
+
+
+def clear_cube():
+    """Drop every cube cell and rewind the watermark so the next rollup refolds all answers."""
+    CohortAnswerStat.objects.all().delete()
+    AggregationWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={"last_id": 0})
+
+
+def retract_attempt(attempt):
+    """Subtract an attempt's already-folded answer rows (call before they are deleted)."""
+    last_id = AggregationWatermark.objects.filter(name=WATERMARK_NAME).values_list("last_id", flat=True).first()
+    if not last_id:
+        return
+    with transaction.atomic():
+        _apply(_deltas(QuizAnswer.objects.filter(attempt=attempt, id__lte=last_id), sign=-1))
@@ -0,0 +1,99 @@
+# core/counters.py
+"""
+Buffered, atomic counters for hot integer columns such as Resource.views_count.
+
+Increments are accumulated in process memory and written back in batches as
+`UPDATE ... SET field = field + n WHERE id IN (...)`, so concurrent requests
+never lose updates and a hot row is written once per flush instead of once
+per request. Flushes run on a timer thread, never inside the request that
+counted, so a busy or locked database cannot fail a read; a failed flush
+keeps its increments and is retried.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCounter:
+    def __init__(self, flush_interval=None):
+        self._flush_interval = flush_interval
+        self._pending = defaultdict(int)  # {(model, field, pk): n}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, "COUNTER_FLUSH_SECONDS", 5)
+
+    def _schedule(self):
+        # caller holds the lock; after a quiet spell the first increment is written right away
+        if self._timer is None:
+            delay = max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+            self._timer = threading.Timer(delay, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def incr(self, model, pk, field="views_count", amount=1):
+        with self._lock:
+            self._pending[(model, field, pk)] += amount
+            self._schedule()
+
+    def pending(self, model, pk, field="views_count"):
+        with self._lock:
+            return self._pending.get((model, field, pk), 0)
+
+    def flush(self):
+        """Write all pending increments; returns the number of UPDATE statements issued."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._last_flush = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        # rows sharing the same increment are updated by a single statement
+        grouped = defaultdict(list)
+        for (model, field, pk), amount in pending.items():
+            grouped[(model, field, amount)].append(pk)
+
+        statements = 0
+        try:
+            for (model, field, amount), pks in grouped.items():
+                model._default_manager.filter(pk__in=pks).update(**{field: F(field) + amount})
+                statements += 1
+        except Exception:
+            # put unwritten increments back so they are retried on the next flush
+            with self._lock:
+                for (model, field, amount), pks in list(grouped.items())[statements:]:
+                    for pk in pks:
+                        self._pending[(model, field, pk)] += amount
+            raise
+        return statements
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Counter flush failed; retrying in %ss", self.flush_interval)
+            with self._lock:
+                if self._pending:
+                    self._schedule()
+        finally:
+            connections.close_all()
+
+
+view_counter = BufferedCounter()
+atexit.register(view_counter.flush)
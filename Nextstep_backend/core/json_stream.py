@@ -0,0 +1,206 @@
+# core/json_stream.py
+"""
+Incremental readers for large seed files.
+
+iter_records() walks a JSON document with a small buffered scanner and
+yields the elements of the arrays found at a key path one at a time, e.g.
+("quizQuestions", "*") for every audience list of careerData.json. Only the
+current element is ever decoded (json.JSONDecoder.raw_decode); sibling
+sections that are not on the path are skipped by bracket matching without
+building Python objects, so memory use depends on the size of one record,
+not of the file. iter_keys() lists the top-level sections the same way.
+
+iter_jsonl() reads JSON Lines (one record per line); detect_format() picks
+between the two from a --format option or the file extension.
+"""
+import json
+import os
+import re
+
+CHUNK_SIZE = 64 * 1024
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789.eE+-"
+_decoder = json.JSONDecoder()
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class _Scanner:
+    def __init__(self, fh, chunk_size=CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop what has been consumed so the buffer stays about one chunk long
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def read_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # the value may continue in the next chunk
+                if self._fill():
+                    continue
+                raise
+            # a number running to the end of the buffer could still be cut short
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                tail = end
+                while tail < len(self.buf) and self.buf[tail] in _NUMBER_CHARS:
+                    tail += 1
+                if tail == len(self.buf) and self._fill():
+                    continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        if self.peek() not in "[{":
+            self.read_value()
+            return
+        depth, in_string = 0, False
+        while True:
+            pattern = _STRING_SPECIAL if in_string else _STRUCTURAL
+            match = pattern.search(self.buf, self.pos)
+            # a trailing backslash needs the next chunk to know what it escapes
+            if match is None or match.end() == len(self.buf) and match.group() == "\\":
+                self.pos = len(self.buf) if match is None else match.start()
+                if not self._fill():
+                    raise ValueError("Unexpected end of file inside a JSON value")
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if in_string:
+                if char == '"':
+                    in_string = False
+                else:
+                    self.pos += 1  # skip the escaped character
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def iter_object(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def _walk(scanner, path, keys):
+    if not path:
+        if scanner.peek() != "[":
+            raise ValueError(f"Expected an array at {'/'.join(keys) or 'the top level'}")
+        for _ in scanner.iter_array():
+            yield tuple(keys), scanner.read_value()
+        return
+    if scanner.peek() != "{":
+        scanner.skip_value()
+        return
+    head, rest = path[0], path[1:]
+    for key in scanner.iter_object():
+        if head == "*" or key == head:
+            yield from _walk(scanner, rest, keys + [key])
+        else:
+            scanner.skip_value()
+
+
+def iter_records(fh, path=(), chunk_size=CHUNK_SIZE):
+    """
+    Yield (keys, element) for every element of the arrays at `path` in a JSON
+    document; "*" matches any object key and `keys` holds the matched keys.
+    """
+    yield from _walk(_Scanner(fh, chunk_size), tuple(path), [])
+
+
+def iter_keys(fh, chunk_size=CHUNK_SIZE):
+    """Yield the top-level keys of a JSON object, skipping their values."""
+    scanner = _Scanner(fh, chunk_size)
+    if scanner.peek() != "{":
+        raise ValueError("Expected an object at the top level")
+    for key in scanner.iter_object():
+        yield key
+        scanner.skip_value()
+
+
+def iter_jsonl(fh):
+    """Yield one decoded record per non-blank line."""
+    for number, line in enumerate(fh, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {number}: {e}") from e
+
+
+def detect_format(path, fmt="auto"):
+    if fmt and fmt != "auto":
+        return fmt
+    return "jsonl" if os.path.splitext(path)[1].lower() in JSONL_EXTENSIONS else "json"
+
+
+def batched(iterable, size):
+    """Group an iterable into lists of at most `size` items."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from core.archive import ARCHIVE_FIELDS, PartitionedWriter, default_archive_root
+from core.models import Interaction, AggregationWatermark
+from core.management.commands.rollup_interactions import WATERMARK_NAME as ROLLUP_WATERMARK
+
+
+class Command(BaseCommand):
+    help = ("Archive interactions older than a cutoff to gzip JSONL partitioned by month/type, "
+            "then delete them from the database in chunks.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=180, help='Archive interactions created before now - N days.')
+        parser.add_argument('--output', default=None, help='Archive root directory (defaults to settings.INTERACTION_ARCHIVE_DIR).')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per iterator chunk and ids deleted per transaction.')
+        parser.add_argument('--keep', action='store_true', help='Write the archive but do not delete the rows.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would be archived.')
+        parser.add_argument('--ignore-rollup', action='store_true',
+                            help='Also archive rows not yet folded into the daily stats by rollup_interactions.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        chunk_size = max(1, options['chunk_size'])
+        root = options['output'] or default_archive_root()
+
+        qs = Interaction.objects.filter(created_at__lt=cutoff)
+        if not options['ignore_rollup']:
+            # never drop raw rows the daily rollup has not seen yet
+            watermark = AggregationWatermark.objects.filter(name=ROLLUP_WATERMARK).values_list('last_id', flat=True).first() or 0
+            qs = qs.filter(id__lte=watermark)
+
+        bounds = qs.aggregate(lo=Min('id'), hi=Max('id'))
+        if bounds['lo'] is None:
+            msg = f'Nothing to archive before {cutoff:%Y-%m-%d}.'
+            if not options['ignore_rollup']:
+                msg += ' Rows not yet processed by rollup_interactions are kept.'
+            self.stdout.write(self.style.SUCCESS(msg))
+            return
+        qs = qs.filter(id__gte=bounds['lo'], id__lte=bounds['hi'])
+
+        if options['dry_run']:
+            self.stdout.write(f'Would archive {qs.count()} interactions (ids {bounds["lo"]}..{bounds["hi"]}) to {root}.')
+            return
+
+        writer = PartitionedWriter(root, part_name=f'part-{timezone.now():%Y%m%dT%H%M%S}-{bounds["lo"]}-{bounds["hi"]}')
+        try:
+            for row in qs.order_by('id').values(*ARCHIVE_FIELDS).iterator(chunk_size=chunk_size):
+                writer.write(row)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+
+        archived = sum(writer.counts.values())
+        for (month, interaction_type), n in sorted(writer.counts.items()):
+            self.stdout.write(f'  month={month} type={interaction_type}: {n}')
+
+        if options['keep']:
+            self.stdout.write(self.style.SUCCESS(f'Archived {archived} interactions to {root} (rows kept).'))
+            return
+
+        deleted = 0
+        start = bounds['lo']
+        while start <= bounds['hi']:
+            end = start + chunk_size
+            with transaction.atomic():
+                n, _ = qs.filter(id__gte=start, id__lt=end).delete()
+            deleted += n
+            start = end
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} and deleted {deleted} interactions to {root}.'))
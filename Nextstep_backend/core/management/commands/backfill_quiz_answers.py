@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.cohorts import clear_cube
+from core.models import QuizAnswer, QuizAttempt, QuizQuestion
+
+
+class Command(BaseCommand):
+    help = "Populate the normalized QuizAnswer table from QuizAttempt.answers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Delete all QuizAnswer rows (and the cohort cube built from them) first and re-derive every attempt.')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Attempts processed per transaction.')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            # the re-created rows get new ids past the cohort watermark, so the cube must be refolded from scratch
+            with transaction.atomic():
+                QuizAnswer.objects.all().delete()
+                clear_cube()
+            self.stdout.write(self.style.WARNING('Cleared the answer rows and the cohort cube; run rollup_quiz_cohorts afterwards.'))
+
+        # valid question ids per quiz, loaded once
+        question_ids = {}
+        for pk, quiz_id in QuizQuestion.objects.values_list('pk', 'quiz_id').iterator():
+            question_ids.setdefault(quiz_id, set()).add(pk)
+
+        attempts = (
+            QuizAttempt.objects.exclude(answers=None)
+            .filter(answer_rows__isnull=True)
+            .select_related('user__profile')
+            .only('id', 'quiz_id', 'answers', 'started_at', 'completed_at', 'user__role', 'user__profile__education_level')
+            .order_by('id')
+        )
+
+        processed = created = 0
+        batch = []
+        for attempt in attempts.iterator(chunk_size=options['batch_size']):
+            batch.extend(QuizAnswer.rows_for(attempt, question_ids.get(attempt.quiz_id, set())))
+            processed += 1
+            if processed % options['batch_size'] == 0:
+                created += self._flush(batch)
+                batch = []
+        created += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {created} answer rows from {processed} attempts.'))
+
+    def _flush(self, rows):
+        if not rows:
+            return 0
+        with transaction.atomic():
+            QuizAnswer.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
@@ -0,0 +1,37 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.answer_mapping import compile_question_mappings
+from core.json_stream import iter_records
+
+
+class Command(BaseCommand):
+    help = "Compile careerData.json answersMapping into QuizOptionMapping rows (rerun after importing careers/resources to resolve ids)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            dest='json_file',
+            help='Path to careerData.json (defaults to settings.CAREER_DATA_FILE)',
+            default=None,
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Questions compiled per batch')
+
+    def handle(self, *args, **options):
+        json_path = options.get('json_file') or settings.CAREER_DATA_FILE
+        if not os.path.exists(json_path):
+            self.stdout.write(self.style.ERROR(f'JSON file not found: {json_path}'))
+            return
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as fh:
+                # (audience, question) pairs, one decoded question at a time
+                records = ((keys[1], q) for keys, q in iter_records(fh, ('quizQuestions', '*')))
+                created, updated, deleted = compile_question_mappings(records, batch_size=options['batch_size'])
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f'Could not read {json_path}: {e}'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'Option mappings: {created} created, {updated} updated, {deleted} removed.'))
@@ -0,0 +1,41 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand
+
+from core.catalog_snapshot import dump_catalog
+
+
+def open_snapshot(path, mode):
+    """Snapshots ending in .gz are gzip-compressed; '-' means stdin/stdout."""
+    if path == '-':
+        return None
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    return open(path, mode, encoding='utf-8')
+
+
+class Command(BaseCommand):
+    help = ("Stream the content catalog (tags, skills, careers, resources, multimedia, success stories, "
+            "quizzes and questions) to a JSON Lines snapshot, gzip-compressed when the name ends in .gz.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Snapshot path (e.g. catalog.jsonl.gz), or '-' for stdout.")
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per iterator chunk.')
+
+    def handle(self, *args, **options):
+        path = options['output']
+        fh = open_snapshot(path, 'w')
+        out = fh or sys.stdout
+        counts = {}
+        try:
+            for line in dump_catalog(chunk_size=max(1, options['chunk_size']), counts=counts):
+                out.write(line)
+                out.write('\n')
+        finally:
+            if fh is not None:
+                fh.close()
+
+        if fh is not None:
+            summary = ', '.join(f'{label}: {n}' for label, n in counts.items()) or 'empty catalog'
+            self.stdout.write(self.style.SUCCESS(f'Wrote {path} ({summary}).'))
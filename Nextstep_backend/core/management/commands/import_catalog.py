@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError
+
+from core.catalog_snapshot import restore_catalog
+from core.management.commands.export_catalog import open_snapshot
+
+
+class Command(BaseCommand):
+    help = ("Restore a snapshot written by export_catalog. Tags and skills are matched on their names, "
+            "other rows are upserted on their primary key in bulk batches and M2M links are replaced per batch, "
+            "all in one transaction.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="Snapshot path (.jsonl or .jsonl.gz), or '-' for stdin.")
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows written per bulk batch.')
+
+    def handle(self, *args, **options):
+        path = options['input']
+        try:
+            fh = open_snapshot(path, 'r')
+        except FileNotFoundError:
+            self.stdout.write(self.style.ERROR(f'File not found at {path}'))
+            return
+        try:
+            result = restore_catalog(fh or sys.stdin, batch_size=max(1, options['batch_size']))
+        except (ValueError, KeyError) as e:
+            self.stdout.write(self.style.ERROR(f'Could not restore {path}: {e}'))
+            return
+        except IntegrityError as e:
+            # nothing was written: the restore runs in one transaction
+            self.stdout.write(self.style.ERROR(
+                f'Could not restore {path}: a snapshot row conflicts with existing data ({e}). Nothing was changed.'
+            ))
+            return
+        finally:
+            if fh is not None:
+                fh.close()
+
+        self.stdout.write(self.style.SUCCESS(f'Restored catalog: {result}'))
+        self.stdout.write('Run compile_answer_mappings to rebuild the option -> career index for the restored quizzes.')
@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.answer_mapping import compile_question_mappings
+from core.catalog_import import SECTIONS, import_catalog
+from core.json_stream import iter_keys, iter_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert careers, resources, multimedia and success stories from careerData.json (safe to re-run). "
+        "Each section is read incrementally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            dest='json_file',
+            help='Path to careerData.json (defaults to settings.CAREER_DATA_FILE)',
+            default=None,
+        )
+        parser.add_argument(
+            '--section',
+            dest='sections',
+            action='append',
+            choices=list(SECTIONS),
+            help='Only import this section (repeatable); all sections by default',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def read(self, json_path, path):
+        """(keys, element) pairs of the arrays at `path`, one pass over the file each."""
+        with open(json_path, 'r', encoding='utf-8') as fh:
+            yield from iter_records(fh, path)
+
+    def handle(self, *args, **options):
+        json_path = options.get('json_file') or settings.CAREER_DATA_FILE
+        if not os.path.exists(json_path):
+            self.stdout.write(self.style.ERROR(f'JSON file not found: {json_path}'))
+            return
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as fh:
+                names = list(iter_keys(fh))
+            results = import_catalog(
+                lambda path: self.read(json_path, path),
+                sections=options['sections'],
+                batch_size=options['batch_size'],
+            )
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f'Could not read {json_path}: {e}'))
+            return
+
+        for result in results:
+            self.stdout.write(self.style.SUCCESS(str(result)))
+
+        skipped = [name for name in names if name not in SECTIONS and name != 'quizQuestions']
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'No importer for: {", ".join(skipped)}'))
+
+        # quiz option mappings point at Career/Resource ids by title; refresh them
+        if 'quizQuestions' in names:
+            records = ((keys[1], q) for keys, q in self.read(json_path, ('quizQuestions', '*')))
+            created, updated, deleted = compile_question_mappings(records, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Option mappings: {created} created, {updated} updated, {deleted} removed.'))
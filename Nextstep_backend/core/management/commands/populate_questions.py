@@ -1,47 +1,57 @@
-import json
 from django.core.management.base import BaseCommand
-from core.models import Quiz, QuizQuestion  # Adjust 'your_app' to your app's name
-from django.db import IntegrityError
+from django.db import transaction
+from core.models import Quiz
+from core.json_stream import batched, detect_format, iter_jsonl, iter_records
+from core.quiz_import import ImportResult, clean_question, import_quizzes
+
 
 class Command(BaseCommand):
-    help = 'Populates quiz questions from a JSON file.'
+    help = 'Populates quiz questions from a JSON array or JSON Lines file (read incrementally).'
 
     def add_arguments(self, parser):
-        parser.add_argument('json_file', type=str, help='The path to the JSON file containing quiz questions.')
+        parser.add_argument('json_file', type=str, help='The path to the JSON (array) or .jsonl file containing quiz questions.')
         parser.add_argument('quiz_id', type=int, help='The ID of the quiz to add questions to.')
+        parser.add_argument('--format', choices=['auto', 'json', 'jsonl'], default='auto', help='Input format; auto picks jsonl for .jsonl/.ndjson files.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Questions written per bulk batch.')
+        parser.add_argument('--dry-run', action='store_true', help='Show what would be created/updated without writing anything.')
+
+    def questions(self, fh, fmt):
+        records = iter_jsonl(fh) if fmt == 'jsonl' else (data for _, data in iter_records(fh))
+        for data in records:
+            try:
+                yield clean_question(data)
+            except KeyError as e:
+                self.stdout.write(self.style.ERROR(f'Skipping question due to missing key: {e}'))
+            except (TypeError, ValueError, AttributeError) as e:
+                self.stdout.write(self.style.WARNING(f'Skipping question due to invalid value: {e}'))
 
     def handle(self, *args, **kwargs):
         json_file_path = kwargs['json_file']
         quiz_id = kwargs['quiz_id']
+        dry_run = kwargs['dry_run']
 
-        try:
-            quiz = Quiz.objects.get(id=quiz_id)
-        except Quiz.DoesNotExist:
+        if not Quiz.objects.filter(id=quiz_id).exists():
             self.stdout.write(self.style.ERROR(f'Quiz with ID {quiz_id} does not exist.'))
             return
 
+        # existing questions (same text) are updated in place instead of duplicated
+        result = ImportResult(record_diff=dry_run)
         try:
-            with open(json_file_path, 'r') as f:
-                questions_data = json.load(f)
+            with open(json_file_path, 'r', encoding='utf-8') as f, transaction.atomic():
+                fmt = detect_format(json_file_path, kwargs['format'])
+                for batch in batched(self.questions(f, fmt), kwargs['batch_size']):
+                    import_quizzes([{'quiz_id': quiz_id, 'questions': batch}], dry_run=dry_run, batch_size=kwargs['batch_size'], result=result)
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'File not found at {json_file_path}'))
             return
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f'Invalid input in {json_file_path}: {e}'))
+            return
 
-        created_count = 0
-        for data in questions_data:
-            try:
-                QuizQuestion.objects.create(
-                    quiz=quiz,
-                    question_text=data['question_text'],
-                    type=data.get('type', 'mcq'),  # Use .get() to provide a default
-                    options=data.get('options'),
-                    correct_answer=data.get('correct_answer'),
-                    weightage=data.get('weightage', 1.0)
-                )
-                created_count += 1
-            except KeyError as e:
-                self.stdout.write(self.style.ERROR(f'Skipping question due to missing key: {e}'))
-            except IntegrityError as e:
-                self.stdout.write(self.style.WARNING(f'Skipping question due to database error: {e}'))
+        if dry_run:
+            for line in result.diff_lines():
+                self.stdout.write(line)
+            self.stdout.write(self.style.SUCCESS(f'Dry run for Quiz ID {quiz_id}, nothing written: {result.summary()}'))
+            return
 
-        self.stdout.write(self.style.SUCCESS(f'Successfully populated {created_count} questions for Quiz ID {quiz_id}.'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f'Successfully populated Quiz ID {quiz_id}: {result.summary()}'))
@@ -1,94 +1,91 @@
-import json
 import os
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from core.models import Quiz, QuizQuestion
+from django.db import transaction
+from core.answer_mapping import compile_question_mappings
+from core.json_stream import batched, detect_format, iter_jsonl, iter_records
+from core.quiz_import import ImportResult, clean_question, import_quizzes
 
 
 class Command(BaseCommand):
-    help = "Populate Quiz and QuizQuestion models from careerData.json"
+    help = (
+        "Populate Quiz and QuizQuestion models from careerData.json, or from a JSON Lines file "
+        "with one question per line carrying an 'audience' key. Files are read incrementally."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--json',
             dest='json_file',
-            help='Path to careerData.json (defaults to frontend data file)',
+            help='Path to careerData.json or a .jsonl file (defaults to settings.CAREER_DATA_FILE)',
             default=None,
         )
+        parser.add_argument(
+            '--format',
+            choices=['auto', 'json', 'jsonl'],
+            default='auto',
+            help='Input format; auto picks jsonl for .jsonl/.ndjson files',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Questions written per bulk batch')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show which quizzes/questions would be created or updated without writing anything',
+        )
 
-    def handle(self, *args, **options):
-        # Determine default path if not provided
-        json_path = options.get('json_file')
-        if not json_path:
-            # default relative path into the frontend folder
-            repo_root = settings.BASE_DIR if hasattr(settings, 'BASE_DIR') else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            json_path = os.path.join(repo_root, '..', 'Nextstep-frontend', 'nextstep-navigator', 'src', 'data', 'careerData.json')
-            # C:\Users\ibito\Documents\GitHub\Nextstep-with-backend\Nextstep-frontend\nextstep-navigator\src\data\careerData.json
-            json_path = os.path.normpath(json_path)
-
-        if not os.path.exists(json_path):
-            self.stdout.write(self.style.ERROR(f'JSON file not found: {json_path}'))
-            return
-
+    def records(self, json_path, fmt):
+        """(audience, question dict) pairs, read one at a time."""
         with open(json_path, 'r', encoding='utf-8') as fh:
-            data = json.load(fh)
-
-        # We expect quizQuestions keyed by audience groups in the JSON
-        quiz_questions = data.get('quizQuestions', {})
-        created_quizzes = 0
-        created_questions = 0
-
-        for audience, questions in quiz_questions.items():
-            title = f"Career quiz - {audience.capitalize()}"
-            quiz, created = Quiz.objects.get_or_create(title=title, defaults={'description': f'Auto-generated quiz for {audience} audience'})
-            if created:
-                created_quizzes += 1
-
-            for q in questions:
-                # Map JSON fields to model fields; handle options and missing keys safely
-                question_text = q.get('question') or q.get('question_text') or q.get('questionText')
-                if not question_text:
-                    continue
-
-                options = q.get('options')
-                # If options are present but not JSON serializable in our DB shape, keep as-is
-                qtype = q.get('type') or q.get('difficulty') or 'mcq'
-
-                # For MCQ, ensure options is a list; otherwise leave null
-                if isinstance(options, list):
-                    options_field = options
-                else:
-                    options_field = None
-
-                # try to extract a plausible correct answer from answersMapping if present
-                correct_answer = None
-                answers_map = q.get('answersMapping') or {}
-                if answers_map and isinstance(answers_map, dict):
-                    # choose the first mapping that contains a non-empty mapping with a key like 'recommended'
-                    for opt_text, mapping in answers_map.items():
-                        if mapping and isinstance(mapping, dict):
-                            # If mapping contains followUpResources or industries, we won't treat as correct, but keep the option text
-                            correct_answer = opt_text
-                            break
-
-                # Create or update question
-                try:
-                    qq, qc = QuizQuestion.objects.get_or_create(
-                        quiz=quiz,
-                        question_text=question_text,
-                        defaults={
-                            'type': 'mcq' if options_field else 'text',
-                            'options': options_field,
-                            'correct_answer': correct_answer,
-                            'weightage': 1.0,
-                        },
-                    )
-                    if qc:
-                        created_questions += 1
-                except Exception as e:
-                    self.stdout.write(self.style.WARNING(f'Could not create question "{question_text[:40]}...": {e}'))
-
-            # Add two extra generic questions per audience to expand the quiz
+            if fmt == 'jsonl':
+                for q in iter_jsonl(fh):
+                    audience = str(q.get('audience') or '').strip()
+                    if not audience:
+                        self.stdout.write(self.style.WARNING(f'Skipping question without audience: {str(q)[:60]}'))
+                        continue
+                    yield audience, q
+            else:
+                # We expect quizQuestions keyed by audience groups in the JSON
+                for keys, q in iter_records(fh, ('quizQuestions', '*')):
+                    yield keys[1], q
+
+    def questions(self, records):
+        """(audience, model field values) for every question, plus the generic extras per audience."""
+        audiences = {}
+        for audience, q in records:
+            audiences.setdefault(audience, None)
+            # Map JSON fields to model fields; handle options and missing keys safely
+            question_text = q.get('question') or q.get('question_text') or q.get('questionText')
+            if not question_text:
+                continue
+
+            options = q.get('options')
+            # For MCQ, ensure options is a list; otherwise leave null
+            if isinstance(options, list):
+                options_field = options
+            else:
+                options_field = None
+
+            # try to extract a plausible correct answer from answersMapping if present
+            correct_answer = None
+            answers_map = q.get('answersMapping') or {}
+            if answers_map and isinstance(answers_map, dict):
+                # choose the first mapping that contains a non-empty mapping with a key like 'recommended'
+                for opt_text, mapping in answers_map.items():
+                    if mapping and isinstance(mapping, dict):
+                        # If mapping contains followUpResources or industries, we won't treat as correct, but keep the option text
+                        correct_answer = opt_text
+                        break
+
+            yield audience, clean_question({
+                'question_text': question_text,
+                'type': 'mcq' if options_field else 'text',
+                'options': options_field,
+                'correct_answer': correct_answer,
+                'weightage': 1.0,
+            })
+
+        # Add two extra generic questions per audience to expand the quiz
+        for audience in audiences:
             extras = [
                 {
                     'question': f'What is your main goal as a {audience}?',
@@ -99,21 +96,49 @@ class Command(BaseCommand):
                     'options': ['<5 hours', '5-10 hours', '10-20 hours', '>20 hours'],
                 },
             ]
-
             for ex in extras:
-                try:
-                    qq, qc = QuizQuestion.objects.get_or_create(
-                        quiz=quiz,
-                        question_text=ex['question'],
-                        defaults={
-                            'type': 'mcq',
-                            'options': ex['options'],
-                            'weightage': 1.0,
-                        },
-                    )
-                    if qc:
-                        created_questions += 1
-                except Exception as e:
-                    self.stdout.write(self.style.WARNING(f'Could not create extra question "{ex["question"][:40]}...": {e}'))
+                yield audience, clean_question({
+                    'question_text': ex['question'],
+                    'type': 'mcq',
+                    'options': ex['options'],
+                    'weightage': 1.0,
+                })
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+        json_path = options.get('json_file') or settings.CAREER_DATA_FILE
+
+        if not os.path.exists(json_path):
+            self.stdout.write(self.style.ERROR(f'JSON file not found: {json_path}'))
+            return
+        fmt = detect_format(json_path, options['format'])
+
+        # fixed-size batches, all inside one transaction; unchanged questions are not touched
+        result = ImportResult(record_diff=dry_run)
+        try:
+            with transaction.atomic():
+                for batch in batched(self.questions(self.records(json_path, fmt)), batch_size):
+                    specs = {}
+                    for audience, values in batch:
+                        spec = specs.setdefault(audience, {
+                            'title': f"Career quiz - {audience.capitalize()}",
+                            'defaults': {'description': f'Auto-generated quiz for {audience} audience', 'audience': audience.lower()},
+                            'questions': [],
+                        })
+                        spec['questions'].append(values)
+                    import_quizzes(specs.values(), dry_run=dry_run, batch_size=batch_size, result=result)
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f'Could not read {json_path}: {e}'))
+            return
+
+        if dry_run:
+            for line in result.diff_lines():
+                self.stdout.write(line)
+            self.stdout.write(self.style.SUCCESS(f'Dry run, nothing written: {result.summary()}'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Imported quizzes: {result.summary()}'))
 
-        self.stdout.write(self.style.SUCCESS(f'Created/updated {created_quizzes} quizzes and {created_questions} questions.'))
+        # keep the option -> career/resource index in step with the questions (second streaming pass)
+        mapped, remapped, unmapped = compile_question_mappings(self.records(json_path, fmt), batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Option mappings: {mapped} created, {remapped} updated, {unmapped} removed.'))
@@ -1,28 +1,34 @@
-import json
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.text import slugify
 from core.models import Tag
-from django.db import IntegrityError
+from core.versions import bump_model_versions
+from core.json_stream import batched, detect_format, iter_jsonl, iter_records
 
 
 class Command(BaseCommand):
     help = 'Populate Tag objects for interests. Usage: python manage.py populate_tags [optional_json_file]'
 
     def add_arguments(self, parser):
-        parser.add_argument('json_file', nargs='?', type=str, help='Optional path to a JSON file containing tags list (array of {name, slug?})')
+        parser.add_argument('json_file', nargs='?', type=str, help='Optional path to a JSON file containing tags list (array of {name, slug?}) or a .jsonl file with one tag per line')
+        parser.add_argument('--format', choices=['auto', 'json', 'jsonl'], default='auto', help='Input format; auto picks jsonl for .jsonl/.ndjson files')
+        parser.add_argument('--batch-size', type=int, default=500, help='Tags written per bulk batch')
+
+    def records(self, json_file, fmt):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            if fmt == 'jsonl':
+                yield from iter_jsonl(f)
+            else:
+                for _, entry in iter_records(f):
+                    yield entry
 
     def handle(self, *args, **kwargs):
         json_file = kwargs.get('json_file')
 
         if json_file:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    tags_data = json.load(f)
-            except FileNotFoundError:
-                self.stdout.write(self.style.ERROR(f'File not found: {json_file}'))
-                return
-            except json.JSONDecodeError as e:
-                self.stdout.write(self.style.ERROR(f'Invalid JSON file: {e}'))
-                return
+            tags_data = self.records(json_file, detect_format(json_file, kwargs['format']))
         else:
             # Default tags list to seed common interests
             tags_data = [
@@ -46,27 +52,47 @@ class Command(BaseCommand):
 
         created = 0
         skipped = 0
-        for entry in tags_data:
-            name = entry.get('name') if isinstance(entry, dict) else str(entry)
-            slug = entry.get('slug') if isinstance(entry, dict) else None
-            if not name:
-                self.stdout.write(self.style.WARNING('Skipping empty tag entry'))
-                continue
-
-            # Idempotent create: skip if a tag with same name or slug exists
-            try:
-                tag_qs = Tag.objects.filter(name__iexact=name)
-                if slug:
-                    tag_qs = tag_qs | Tag.objects.filter(slug__iexact=slug)
-
-                if tag_qs.exists():
-                    skipped += 1
-                    continue
+        try:
+            with transaction.atomic():
+                for batch in batched(tags_data, kwargs['batch_size']):
+                    wanted, batch_slugs = {}, set()
+                    for entry in batch:
+                        name = entry.get('name') if isinstance(entry, dict) else str(entry)
+                        slug = entry.get('slug') if isinstance(entry, dict) else None
+                        if not name:
+                            self.stdout.write(self.style.WARNING('Skipping empty tag entry'))
+                            continue
+                        slug = slug or slugify(name)
+                        # both columns are unique, so a repeat of either would be dropped by the database
+                        if name.lower() in wanted or not slug or slug.lower() in batch_slugs:
+                            skipped += 1
+                            continue
+                        batch_slugs.add(slug.lower())
+                        wanted[name.lower()] = Tag(name=name, slug=slug)
 
-                Tag.objects.create(name=name, slug=slug if slug else None)
-                created += 1
-            except IntegrityError as e:
-                self.stdout.write(self.style.WARNING(f'Skipped {name} due to DB error: {e}'))
-                skipped += 1
+                    # Idempotent create: skip if a tag with same name or slug exists (one query per batch)
+                    slugs = {t.slug.lower() for t in wanted.values()}
+                    existing = Tag.objects.annotate(lname=Lower('name'), lslug=Lower('slug')).filter(
+                        Q(lname__in=list(wanted)) | Q(lslug__in=slugs)
+                    ).values_list('lname', 'lslug')
+                    taken_names, taken_slugs = set(), set()
+                    for lname, lslug in existing:
+                        taken_names.add(lname)
+                        taken_slugs.add(lslug)
+                    new = [t for key, t in wanted.items() if key not in taken_names and t.slug.lower() not in taken_slugs]
+                    # count what was really inserted: ignore_conflicts drops rows silently
+                    before = Tag.objects.count()
+                    Tag.objects.bulk_create(new, ignore_conflicts=True)
+                    inserted = Tag.objects.count() - before if new else 0
+                    if inserted:
+                        bump_model_versions(Tag)
+                    created += inserted
+                    skipped += len(wanted) - inserted
+        except FileNotFoundError:
+            self.stdout.write(self.style.ERROR(f'File not found: {json_file}'))
+            return
+        except ValueError as e:
+            self.stdout.write(self.style.ERROR(f'Invalid JSON file: {e}'))
+            return
 
         self.stdout.write(self.style.SUCCESS(f'Created {created} tags, skipped {skipped} existing/failed entries.'))
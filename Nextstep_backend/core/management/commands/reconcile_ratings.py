@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count, FloatField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.models import Multimedia, MultimediaRating
+from core.versions import bump_model_versions
+
+
+class Command(BaseCommand):
+    help = "Recompute Multimedia.rating_avg / rating_count from MultimediaRating rows in one bulk UPDATE."
+
+    def handle(self, *args, **options):
+        per_item = (
+            MultimediaRating.objects.filter(multimedia=OuterRef('pk'))
+            .values('multimedia')
+            .order_by()
+        )
+        avg_sq = Subquery(per_item.annotate(v=Avg('score')).values('v'), output_field=FloatField())
+        count_sq = Subquery(per_item.annotate(n=Count('id')).values('n'), output_field=IntegerField())
+
+        with transaction.atomic():
+            updated = Multimedia.objects.update(
+                rating_avg=Coalesce(avg_sq, Value(0.0)),
+                rating_count=Coalesce(count_sq, Value(0)),
+            )
+            bump_model_versions(Multimedia)
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled ratings for {updated} multimedia items.'))
@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import QuizAttempt
+from core.quiz_cache import current_snapshot_id
+from core.scoring import compiled_for
+
+
+class Command(BaseCommand):
+    help = ("Recompute QuizAttempt.score for completed attempts. Pinned attempts are scored against the snapshot "
+            "they were answered on; --repin moves them to the quiz's current questions (e.g. after an answer key fix).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, action='append', dest='quiz_ids', help='Only rescore this quiz id (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Attempts scored and written per batch.')
+        parser.add_argument('--repin', action='store_true', help="Score against the quiz's current questions and pin attempts to that snapshot.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        # SQL NULL and {} are never scored (the API leaves their score empty)
+        attempts = QuizAttempt.objects.exclude(answers__isnull=True).exclude(answers={})
+        if options['quiz_ids']:
+            attempts = attempts.filter(quiz_id__in=options['quiz_ids'])
+        if options['repin']:
+            quiz_ids = attempts.order_by().values_list('quiz_id', flat=True).distinct()
+            groups = [(quiz_id, current_snapshot_id(quiz_id)) for quiz_id in quiz_ids]
+        else:
+            groups = list(attempts.order_by().values_list('quiz_id', 'snapshot_id').distinct())
+        quiz_ids = {quiz_id for quiz_id, _ in groups}
+
+        total = 0
+        for quiz_id, snapshot_id in groups:
+            # attempts from before pinning have no snapshot: they were always scored on the live key
+            compiled = compiled_for(quiz_id, snapshot_id)
+            group = attempts.filter(quiz_id=quiz_id)
+            if not options['repin']:
+                group = group.filter(snapshot_id=snapshot_id)
+            batch = []
+            for attempt in group.only('id', 'answers', 'snapshot_id').order_by('id').iterator(chunk_size=options['batch_size']):
+                attempt.snapshot_id = snapshot_id
+                batch.append(attempt)
+                if len(batch) >= options['batch_size']:
+                    total += self._rescore(compiled, batch)
+                    batch = []
+            total += self._rescore(compiled, batch)
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(f'Rescored {total} attempts across {len(quiz_ids)} quizzes in {elapsed:.2f}s ({rate:.0f}/s).'))
+
+    def _rescore(self, compiled, batch):
+        # legacy rows written before answers were validated may not be an answers dict
+        batch = [a for a in batch if isinstance(a.answers, dict)]
+        if not batch:
+            return 0
+        matrix = np.vstack([compiled.encode(a.answers) for a in batch])
+        scores = compiled.score_matrix(matrix)
+        for attempt, value in zip(batch, scores.tolist()):
+            attempt.score = None if np.isnan(value) or not compiled.answered(attempt.answers) else value
+        with transaction.atomic():
+            QuizAttempt.objects.bulk_update(batch, ['score', 'snapshot_id'], batch_size=1000)
+        return len(batch)
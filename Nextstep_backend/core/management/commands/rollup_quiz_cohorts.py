@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from core.cohorts import WATERMARK_NAME, clear_cube, fold_range
+from core.models import AggregationWatermark, QuizAnswer
+
+
+class Command(BaseCommand):
+    help = "Fold new QuizAnswer rows into the CohortAnswerStat cube (incremental, resumable)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50000, help='QuizAnswer ids folded per transaction.')
+        parser.add_argument('--rebuild', action='store_true', help='Drop the cube and recompute it from all answers.')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+
+        if options['rebuild']:
+            with transaction.atomic():
+                clear_cube()
+            self.stdout.write(self.style.WARNING('Cleared the cohort cube.'))
+
+        watermark, _ = AggregationWatermark.objects.get_or_create(name=WATERMARK_NAME)
+        max_id = QuizAnswer.objects.aggregate(m=Max('id'))['m'] or 0
+
+        folded = touched = 0
+        start = watermark.last_id
+        while start < max_id:
+            end = min(start + batch_size, max_id)
+            with transaction.atomic():
+                answers, cells = fold_range(start, end)
+                watermark.last_id = end
+                watermark.save(update_fields=['last_id', 'updated_at'])
+            folded += answers
+            touched += cells
+            start = end
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Folded {folded} answers into {touched} cohort cells (watermark {watermark.last_id}).'
+        ))
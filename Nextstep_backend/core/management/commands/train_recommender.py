@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import ItemNeighbor, UserRecommendation
+from core.recommender import item_neighbors, load_interaction_matrix, unpack_items, user_recommendations
+
+
+class Command(BaseCommand):
+    help = "Train the item-item collaborative filtering recommender from Interaction and store top-K neighbours and per-user picks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=20, help='Neighbours kept per item.')
+        parser.add_argument('--per-user', type=int, default=20, help='Recommendations kept per user.')
+        parser.add_argument('--block-size', type=int, default=2048, help='Rows multiplied at once; bounds peak memory.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        data = load_interaction_matrix()
+        n_items, n_users = data.shape
+        self.stdout.write(f'Loaded {data.matrix.nnz} user/item pairs ({n_items} items, {n_users} users).')
+        if not n_items:
+            self.stdout.write(self.style.WARNING('No interactions to train on.'))
+            return
+
+        neighbors = item_neighbors(data, k=options['top_k'], block_size=options['block_size'])
+        item_cts, item_oids = unpack_items(data.item_keys)
+        item_cts, item_oids = item_cts.tolist(), item_oids.tolist()
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            ItemNeighbor.objects.all().delete()
+            batch = []
+            for row in range(n_items):
+                start, end = neighbors.indptr[row], neighbors.indptr[row + 1]
+                cols, vals = neighbors.indices[start:end], neighbors.data[start:end]
+                for rank, i in enumerate(sorted(range(len(cols)), key=lambda j: -vals[j]), start=1):
+                    col = cols[i]
+                    batch.append(ItemNeighbor(
+                        content_type_id=item_cts[row], object_id=item_oids[row],
+                        neighbor_content_type_id=item_cts[col], neighbor_object_id=item_oids[col],
+                        score=float(vals[i]), rank=rank,
+                    ))
+                if len(batch) >= batch_size:
+                    ItemNeighbor.objects.bulk_create(batch)
+                    batch = []
+            ItemNeighbor.objects.bulk_create(batch)
+
+            UserRecommendation.objects.all().delete()
+            batch = []
+            user_ids = data.user_ids.tolist()
+            for user_index, cols, vals in user_recommendations(data, neighbors, n=options['per_user'], block_size=options['block_size']):
+                for rank, (col, val) in enumerate(zip(cols.tolist(), vals.tolist()), start=1):
+                    batch.append(UserRecommendation(
+                        user_id=user_ids[user_index],
+                        content_type_id=item_cts[col], object_id=item_oids[col],
+                        score=val, rank=rank,
+                    ))
+                if len(batch) >= batch_size:
+                    UserRecommendation.objects.bulk_create(batch)
+                    batch = []
+            UserRecommendation.objects.bulk_create(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {neighbors.nnz} item neighbours and {UserRecommendation.objects.count()} user recommendations '
+            f'in {time.monotonic() - started:.1f}s.'
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregationWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=80, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InteractionDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('object_id', models.PositiveIntegerField()),
+                ('interaction_type', models.CharField(choices=[('view', 'View'), ('like', 'Like'), ('save', 'Save'), ('apply', 'Apply'), ('share', 'Share'), ('dismiss', 'Dismiss')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('-day',),
+                'indexes': [models.Index(fields=['content_type', 'interaction_type', 'day'], name='core_intera_content_27d597_idx'), models.Index(fields=['content_type', 'object_id', 'interaction_type', 'day'], name='core_intera_content_b5e4dd_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'content_type', 'object_id', 'interaction_type'), name='uniq_interaction_daily_stat')],
+            },
+        ),
+    ]
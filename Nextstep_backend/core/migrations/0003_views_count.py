@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_interaction_daily_stat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='multimedia',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='successstory',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
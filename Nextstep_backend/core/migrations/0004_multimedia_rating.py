@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_views_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MultimediaRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='multimedia',
+            index=models.Index(fields=['rating_avg'], name='core_multim_rating__0d018e_idx'),
+        ),
+        migrations.AddField(
+            model_name='multimediarating',
+            name='multimedia',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ratings', to='core.multimedia'),
+        ),
+        migrations.AddField(
+            model_name='multimediarating',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='multimedia_ratings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='multimediarating',
+            constraint=models.UniqueConstraint(fields=('user', 'multimedia'), name='uniq_multimedia_rating_per_user'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:45
+
+from django.db import migrations, models
+
+
+def backfill_audience(apps, schema_editor):
+    # populate_quiz names its quizzes "Career quiz - <Audience>"
+    Quiz = apps.get_model('core', 'Quiz')
+    for audience in ('student', 'graduate', 'professional'):
+        Quiz.objects.filter(title__iexact=f'Career quiz - {audience}').update(audience=audience)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_item_neighbors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='audience',
+            field=models.CharField(blank=True, choices=[('student', 'Student'), ('graduate', 'Graduate'), ('professional', 'Professional')], db_index=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='selection_weight',
+            field=models.FloatField(default=1.0),
+        ),
+        migrations.RunPython(backfill_audience, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_quiz_audience'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('questions', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='core.quiz')),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddField(
+            model_name='quizattempt',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attempts', to='core.quizsnapshot'),
+        ),
+        migrations.AddConstraint(
+            model_name='quizsnapshot',
+            constraint=models.UniqueConstraint(fields=('quiz', 'content_hash'), name='uniq_quiz_snapshot_content'),
+        ),
+    ]
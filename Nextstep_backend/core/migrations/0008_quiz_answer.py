@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_quiz_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('option', models.CharField(max_length=255)),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_rows', to='core.quizattempt')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_rows', to='core.quizquestion')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['question', 'option'], name='core_quizan_questio_a3eb9b_idx'), models.Index(fields=['attempt', 'question'], name='core_quizan_attempt_e92e18_idx')],
+            },
+        ),
+    ]
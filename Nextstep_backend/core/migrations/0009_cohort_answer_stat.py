@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_quiz_answer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortAnswerStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('option', models.CharField(max_length=255)),
+                ('role', models.CharField(blank=True, default='', max_length=50)),
+                ('education_level', models.CharField(blank=True, default='', max_length=40)),
+                ('week', models.DateField(help_text='Monday of the week the attempt was completed')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cohort_stats', to='core.quizquestion')),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cohort_stats', to='core.quiz')),
+            ],
+            options={
+                'ordering': ('-week',),
+                'indexes': [models.Index(fields=['quiz', 'week'], name='core_cohort_quiz_id_bca941_idx'), models.Index(fields=['question', 'role', 'education_level'], name='core_cohort_questio_0455f0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('quiz', 'question', 'option', 'role', 'education_level', 'week'), name='uniq_cohort_answer_stat')],
+            },
+        ),
+    ]
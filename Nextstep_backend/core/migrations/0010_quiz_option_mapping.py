@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_cohort_answer_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizOptionMapping',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('option', models.CharField(max_length=255)),
+                ('message', models.TextField(blank=True)),
+                ('weight', models.FloatField(default=1.0)),
+                ('careers', models.JSONField(blank=True, default=list)),
+                ('industries', models.JSONField(blank=True, default=list)),
+                ('resources', models.JSONField(blank=True, default=list)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='option_mappings', to='core.quizquestion')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('question', 'option'), name='uniq_quiz_option_mapping')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_quiz_option_mapping'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizquestion',
+            index=models.Index(fields=['quiz', 'question_text'], name='core_quizqu_quiz_id_577982_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_quizquestion_text_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='multimedia',
+            name='core_multim_rating__0d018e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(fields=['created_at', 'id'], name='core_career_created_8ef059_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(fields=['popularity', 'id'], name='core_career_popular_9496b6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(fields=['expected_salary', 'id'], name='core_career_expecte_1015e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['submitted_at', 'id'], name='core_feedba_submitt_5bfd19_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multimedia',
+            index=models.Index(fields=['rating_avg', 'id'], name='core_multim_rating__c13841_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multimedia',
+            index=models.Index(fields=['created_at', 'id'], name='core_multim_created_32b648_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multimedia',
+            index=models.Index(fields=['views_count', 'id'], name='core_multim_views_c_5ea64c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', 'id'], name='core_quizat_user_id_8e79d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['created_at', 'id'], name='core_resour_created_ecc653_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['views_count', 'id'], name='core_resour_views_c_8b428d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='successstory',
+            index=models.Index(fields=['submitted_at', 'id'], name='core_succes_submitt_1f263f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='successstory',
+            index=models.Index(fields=['views_count', 'id'], name='core_succes_views_c_62236b_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-19 14:10
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_profiles(apps, schema_editor):
+    # profiles are created on user signup from now on (core.signals); give existing users theirs
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserProfile = apps.get_model('core', 'UserProfile')
+    missing = User.objects.filter(profile__isnull=True).values_list('pk', flat=True)
+    UserProfile.objects.bulk_create([UserProfile(user_id=pk) for pk in missing.iterator()], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profiles, migrations.RunPython.noop),
+    ]
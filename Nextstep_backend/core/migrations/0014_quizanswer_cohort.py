@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:33
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_cohorts(apps, schema_editor):
+    # existing rows were folded with the users' values of the time; today's values are the best estimate
+    QuizAttempt = apps.get_model('core', 'QuizAttempt')
+    QuizAnswer = apps.get_model('core', 'QuizAnswer')
+    groups = {}
+    attempts = QuizAttempt.objects.filter(answer_rows__isnull=False).distinct().values_list(
+        'id', 'user__role', 'user__profile__education_level', 'completed_at', 'started_at',
+    )
+    for pk, role, education_level, completed_at, started_at in attempts.iterator():
+        day = timezone.localtime(completed_at or started_at).date()
+        groups.setdefault((role or '', education_level or '', day - timedelta(days=day.weekday())), []).append(pk)
+    for (role, education_level, week), pks in groups.items():
+        for i in range(0, len(pks), 500):
+            QuizAnswer.objects.filter(attempt_id__in=pks[i:i + 500]).update(role=role, education_level=education_level, week=week)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_backfill_user_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizanswer',
+            name='education_level',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='quizanswer',
+            name='role',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='quizanswer',
+            name='week',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_cohorts, migrations.RunPython.noop),
+    ]
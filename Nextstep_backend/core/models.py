@@ -1,6 +1,9 @@
 # models.py
+from datetime import timedelta
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
 from django.utils import timezone
 
 # For generic FK used by Interaction
@@ -46,17 +49,26 @@ class Career(models.Model):
         indexes = [
             models.Index(fields=["title"]),
             models.Index(fields=["domain"]),
+            # (ordering field, id) keys for keyset pagination (core.pagination)
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["popularity", "id"]),
+            models.Index(fields=["expected_salary", "id"]),
         ]
 
     def __str__(self):
         return self.title
 
-    def build_content_text(self):
+    def build_content_text(self, tag_names=None, skill_names=None):
+        # names can be passed in by bulk importers that already resolved them
+        if tag_names is None:
+            tag_names = [t.name for t in self.tags.all()]
+        if skill_names is None:
+            skill_names = [s.name for s in self.required_skills.all()]
         parts = [
             self.title or "",
             self.description or "",
-            " ".join([t.name for t in self.tags.all()]),
-            " ".join([s.name for s in self.required_skills.all()]),
+            " ".join(tag_names),
+            " ".join(skill_names),
         ]
         self.content_text = " | ".join([p.strip() for p in parts if p])
         return self.content_text
@@ -85,11 +97,19 @@ class Resource(models.Model):
     content_text = models.TextField(blank=True, help_text="Denormalized text for embeddings/search")
     embedding_id = models.CharField(max_length=255, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["views_count", "id"]),
+        ]
+
     def __str__(self):
         return self.title
 
-    def build_content_text(self):
-        parts = [self.title or "", self.description or "", " ".join([t.name for t in self.tags.all()])]
+    def build_content_text(self, tag_names=None):
+        if tag_names is None:
+            tag_names = [t.name for t in self.tags.all()]
+        parts = [self.title or "", self.description or "", " ".join(tag_names)]
         self.content_text = " | ".join([p.strip() for p in parts if p])
         return self.content_text
 
@@ -112,6 +132,7 @@ class Multimedia(models.Model):
     transcript = models.TextField(blank=True)
     rating_avg = models.FloatField(default=0.0)
     rating_count = models.PositiveIntegerField(default=0)
+    views_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="multimedia")
 
@@ -119,15 +140,72 @@ class Multimedia(models.Model):
     content_text = models.TextField(blank=True, help_text="Denormalized text for embeddings/search")
     embedding_id = models.CharField(max_length=255, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["rating_avg", "id"]),
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["views_count", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.type})"
 
-    def build_content_text(self):
-        parts = [self.title or "", self.transcript or "", " ".join([t.name for t in self.tags.all()])]
+    def rate(self, user, score):
+        """
+        Record `user`'s rating and fold it into rating_avg/rating_count with a single
+        atomic UPDATE (no AVG over all ratings). A re-rate shifts the average by the
+        difference instead of adding a new vote.
+        """
+        from .versions import bump_model_versions
+        with transaction.atomic():
+            rating, created = MultimediaRating.objects.select_for_update().get_or_create(
+                user=user, multimedia=self, defaults={"score": score}
+            )
+            if created:
+                Multimedia.objects.filter(pk=self.pk).update(
+                    rating_avg=(F("rating_avg") * F("rating_count") + score) / (F("rating_count") + 1),
+                    rating_count=F("rating_count") + 1,
+                )
+            elif rating.score != score:
+                delta = score - rating.score
+                rating.score = score
+                rating.save(update_fields=["score", "updated_at"])
+                Multimedia.objects.filter(pk=self.pk, rating_count__gt=0).update(
+                    rating_avg=F("rating_avg") + Value(float(delta)) / F("rating_count"),
+                )
+            # the UPDATEs above send no signals
+            bump_model_versions(Multimedia)
+        self.refresh_from_db(fields=["rating_avg", "rating_count"])
+        return rating
+
+    def build_content_text(self, tag_names=None):
+        if tag_names is None:
+            tag_names = [t.name for t in self.tags.all()]
+        parts = [self.title or "", self.transcript or "", " ".join(tag_names)]
         self.content_text = " | ".join([p.strip() for p in parts if p])
         return self.content_text
 
 
+# One rating per user per multimedia item; Multimedia.rating_avg/rating_count are maintained from these
+class MultimediaRating(models.Model):
+    SCORE_MIN = 1
+    SCORE_MAX = 5
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="multimedia_ratings")
+    multimedia = models.ForeignKey(Multimedia, on_delete=models.CASCADE, related_name="ratings")
+    score = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "multimedia"], name="uniq_multimedia_rating_per_user"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} rated {self.multimedia_id}: {self.score}"
+
+
 # Success Stories
 class SuccessStory(models.Model):
     title = models.CharField(max_length=255)  # rname from ER = name/title
@@ -139,11 +217,18 @@ class SuccessStory(models.Model):
     approved_at = models.DateTimeField(null=True, blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
     is_approved = models.BooleanField(default=False)
+    views_count = models.PositiveIntegerField(default=0)
 
     # denormalized text for embeddings / search
     content_text = models.TextField(blank=True, help_text="Denormalized text for embeddings/search")
     embedding_id = models.CharField(max_length=255, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["submitted_at", "id"]),
+            models.Index(fields=["views_count", "id"]),
+        ]
+
     def approve(self, approver):
         self.approved_by = approver
         self.approved_at = timezone.now()
@@ -205,15 +290,30 @@ class Feedback(models.Model):
     submitted_at = models.DateTimeField(auto_now_add=True)
     handled_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="handled_feedbacks")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["submitted_at", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.category} - {self.status}"
 
 
 # Quiz system (simple)
 class Quiz(models.Model):
+    AUDIENCE_CHOICES = [
+        ("student", "Student"),
+        ("graduate", "Graduate"),
+        ("professional", "Professional"),
+    ]
+
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
+    # who the quiz is written for (matches accounts.User.role); blank = everyone
+    audience = models.CharField(max_length=50, choices=AUDIENCE_CHOICES, blank=True, default="", db_index=True)
+    # relative chance of being picked by QuizViewSet.random
+    selection_weight = models.FloatField(default=1.0)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -236,22 +336,138 @@ class QuizQuestion(models.Model):
     correct_answer = models.CharField(max_length=255, blank=True, null=True)  # evaluation logic can vary
     weightage = models.FloatField(default=1.0)
 
+    class Meta:
+        indexes = [
+            # importers match questions on (quiz, text)
+            models.Index(fields=["quiz", "question_text"]),
+        ]
+
     def __str__(self):
         return f"Q: {self.question_text[:60]}"
 
 
+# Immutable copy of a quiz's question set; one row per distinct content (see core.quiz_cache)
+class QuizSnapshot(models.Model):
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="snapshots")
+    content_hash = models.CharField(max_length=64)
+    # [{"id", "question_text", "type", "options", "correct_answer", "weightage"}, ...]
+    questions = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        constraints = [
+            models.UniqueConstraint(fields=["quiz", "content_hash"], name="uniq_quiz_snapshot_content"),
+        ]
+
+    def __str__(self):
+        return f"{self.quiz} @ {self.content_hash[:12]}"
+
+
 # Optional: store quiz attempts/answers
 class QuizAttempt(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="quiz_attempts")
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="attempts")
+    # the question set the answers were given against
+    snapshot = models.ForeignKey(QuizSnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name="attempts")
     score = models.FloatField(null=True, blank=True)
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     answers = models.JSONField(blank=True, null=True)  # {"question_id": "selected_option", ...}
 
+    class Meta:
+        indexes = [
+            # a user's attempts, newest first, one keyset page at a time
+            models.Index(fields=["user", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.quiz} ({self.score})"
 
+    def cohort(self):
+        """(role, education_level, week) this attempt's answers are counted under in the cohort cube."""
+        profile = getattr(self.user, "profile", None)
+        day = timezone.localtime(self.completed_at or self.started_at).date()
+        return self.user.role or "", profile.education_level if profile else "", day - timedelta(days=day.weekday())
+
+    def sync_answer_rows(self):
+        """Rewrite this attempt's normalized QuizAnswer rows from the answers JSON."""
+        keys = [k for k in (self.answers or {}) if str(k).isdigit()]
+        question_ids = set(QuizQuestion.objects.filter(quiz_id=self.quiz_id, pk__in=keys).values_list("pk", flat=True))
+        from .cohorts import retract_attempt
+        with transaction.atomic():
+            # keep the cohort cube consistent when answers are re-submitted
+            retract_attempt(self)
+            QuizAnswer.objects.filter(attempt=self).delete()
+            QuizAnswer.objects.bulk_create(QuizAnswer.rows_for(self, question_ids))
+
+
+# One row per (attempt, question, chosen option); mirrors QuizAttempt.answers for indexed analytics
+class QuizAnswer(models.Model):
+    attempt = models.ForeignKey(QuizAttempt, on_delete=models.CASCADE, related_name="answer_rows")
+    question = models.ForeignKey(QuizQuestion, on_delete=models.CASCADE, related_name="answer_rows")
+    option = models.CharField(max_length=255)
+    # cohort cube dimensions as of submission, so retracting hits the cells the row was folded into
+    role = models.CharField(max_length=50, blank=True, default="")
+    education_level = models.CharField(max_length=40, blank=True, default="")
+    week = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["question", "option"]),
+            models.Index(fields=["attempt", "question"]),
+        ]
+
+    def __str__(self):
+        return f"{self.attempt_id} / Q{self.question_id}: {self.option}"
+
+    @staticmethod
+    def normalize(value):
+        """Flatten a submitted answer into option strings (multi-select answers give several)."""
+        values = value if isinstance(value, (list, tuple)) else [value]
+        options = []
+        for v in values:
+            if isinstance(v, dict):
+                v = v.get("id", v.get("value", v.get("text")))
+            if v is None or str(v).strip() == "":
+                continue
+            options.append(str(v).strip()[:255])
+        return options
+
+    @classmethod
+    def rows_for(cls, attempt, question_ids):
+        """Unsaved rows for `attempt`, limited to answers whose question id is in `question_ids`."""
+        rows, cohort = [], None
+        for key, value in (attempt.answers or {}).items():
+            if not str(key).isdigit() or int(key) not in question_ids:
+                continue
+            for option in cls.normalize(value):
+                if cohort is None:
+                    cohort = dict(zip(("role", "education_level", "week"), attempt.cohort()))
+                rows.append(cls(attempt_id=attempt.pk, question_id=int(key), option=option, **cohort))
+        return rows
+
+
+# (question, option) -> weighted careers/industries/resources, compiled from careerData.json answersMapping
+class QuizOptionMapping(models.Model):
+    question = models.ForeignKey(QuizQuestion, on_delete=models.CASCADE, related_name="option_mappings")
+    option = models.CharField(max_length=255)
+    message = models.TextField(blank=True)
+    weight = models.FloatField(default=1.0)
+    # [{"name", "id"}], id is the matching Career / Resource row when there is one
+    careers = models.JSONField(default=list, blank=True)
+    industries = models.JSONField(default=list, blank=True)
+    # [{"type", "title", "url", "id"}]
+    resources = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["question", "option"], name="uniq_quiz_option_mapping"),
+        ]
+
+    def __str__(self):
+        return f"Q{self.question_id}: {self.option} ({self.weight})"
+
 
 # Interaction model for events (views/likes/saves/etc.)
 class Interaction(models.Model):
@@ -282,3 +498,101 @@ class Interaction(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.interaction_type} - {self.content_type}({self.object_id})"
+
+
+# Daily rollup of Interaction rows, maintained by the rollup_interactions command
+class InteractionDailyStat(models.Model):
+    day = models.DateField()
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    interaction_type = models.CharField(max_length=20, choices=Interaction.INTERACTION_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("-day",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "content_type", "object_id", "interaction_type"],
+                name="uniq_interaction_daily_stat",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["content_type", "interaction_type", "day"]),
+            models.Index(fields=["content_type", "object_id", "interaction_type", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.content_type}({self.object_id}) {self.interaction_type}: {self.count}"
+
+
+# Bookkeeping for incremental jobs: last source row id folded into an aggregate
+class AggregationWatermark(models.Model):
+    name = models.CharField(max_length=80, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
+
+
+# Item-item collaborative filtering output, rebuilt by the train_recommender command
+class ItemNeighbor(models.Model):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    object_id = models.PositiveIntegerField()
+    neighbor_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    neighbor_object_id = models.PositiveIntegerField()
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ("rank",)
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "rank"]),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type}({self.object_id}) ~ {self.neighbor_content_type}({self.neighbor_object_id}): {self.score:.3f}"
+
+
+class UserRecommendation(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="recommendations")
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    object_id = models.PositiveIntegerField()
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ("rank",)
+        indexes = [
+            models.Index(fields=["user", "rank"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} -> {self.content_type}({self.object_id}): {self.score:.3f}"
+
+
+# Pre-aggregated quiz answer counts sliced by cohort, maintained by rollup_quiz_cohorts
+class CohortAnswerStat(models.Model):
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="cohort_stats")
+    question = models.ForeignKey(QuizQuestion, on_delete=models.CASCADE, related_name="cohort_stats")
+    option = models.CharField(max_length=255)
+    role = models.CharField(max_length=50, blank=True, default="")
+    education_level = models.CharField(max_length=40, blank=True, default="")
+    week = models.DateField(help_text="Monday of the week the attempt was completed")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("-week",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["quiz", "question", "option", "role", "education_level", "week"],
+                name="uniq_cohort_answer_stat",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["quiz", "week"]),
+            models.Index(fields=["question", "role", "education_level"]),
+        ]
+
+    def __str__(self):
+        return f"{self.week} Q{self.question_id} {self.option} [{self.role}/{self.education_level}]: {self.count}"
@@ -0,0 +1,194 @@
+# core/pagination.py
+"""
+Keyset (cursor) pagination for the catalog list endpoints (careers,
+resources, multimedia, success stories), which opt in with pagination_class.
+
+Pages are ordered on (ordering field, id) and a cursor carries the last row's
+pair, so the next page is a `WHERE (field, id) > (value, pk)` range read on an
+index instead of an OFFSET scan: every page costs the same no matter how deep
+the client goes. The ordering field is the view's ?ordering= (one of its
+ordering_fields, "-" for descending) or its default ordering; NULLs always
+sort last.
+
+    GET /api/core/careers/?ordering=-expected_salary&page_size=50
+    {"next": "...?cursor=eyJv...", "previous": null, "results": [...]}
+
+?total=1 adds "total": an estimate from the query planner on PostgreSQL,
+elsewhere an exact count capped at API_COUNT_LIMIT (with "total_approximate"
+telling the two apart).
+"""
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connection
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    # isoformat keeps microseconds, which DjangoJSONEncoder would drop
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def approximate_count(queryset, limit):
+    """(total, is_approximate) without paying for a full COUNT(*) on large tables."""
+    queryset = queryset.order_by()
+    if connection.vendor == "postgresql":
+        plan = json.loads(queryset.explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+    total = queryset[: limit + 1].count()
+    return min(total, limit), total > limit
+
+
+class KeysetPagination(BasePagination):
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    total_query_param = "total"
+
+    @property
+    def page_size(self):
+        return getattr(settings, "API_PAGE_SIZE", 20)
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, "API_MAX_PAGE_SIZE", 100)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(self.max_page_size, size))
+
+    def _concrete_field(self, model, name):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        return field if field.concrete and not field.many_to_many else None
+
+    def get_ordering(self, request, queryset, view):
+        """'field' or '-field' for the keyset; ?ordering= is honoured for the view's ordering_fields."""
+        model = queryset.model
+        allowed = set(getattr(view, "ordering_fields", None) or []) | {"id"}
+        requested = request.query_params.get(api_settings.ORDERING_PARAM, "").split(",")[0].strip()
+        candidates = [requested] if requested.lstrip("-") in allowed else []
+        default = getattr(view, "ordering", None) or model._meta.ordering or ()
+        candidates += [default] if isinstance(default, str) else list(default)
+        for term in candidates:
+            if isinstance(term, str) and self._concrete_field(model, term.lstrip("-")):
+                return term
+        return "-id"
+
+    def encode_cursor(self, item, reverse):
+        # items are model instances, or dicts from a values() queryset
+        if isinstance(item, dict):
+            value, pk = item[self.field.attname], item["id"]
+        else:
+            value, pk = getattr(item, self.field.attname), item.pk
+        position = {"o": self.ordering, "v": _encode_value(value), "id": pk}
+        if reverse:
+            position["r"] = 1
+        token = base64.urlsafe_b64encode(json.dumps(position, separators=(",", ":")).encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            if position["o"] != self.ordering:
+                # the ordering changed under the cursor: start again from the top
+                return None
+            value = position["v"]
+            value = None if value is None else self.field.to_python(value)
+            return value, int(position["id"]), bool(position.get("r"))
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound("Invalid cursor.")
+
+    def _after(self, value, pk, descending, nulls_last):
+        """Rows strictly after (value, pk) in the given direction."""
+        name, op = self.field.name, "lt" if descending else "gt"
+        tie = Q(**{f"id__{op}": pk})
+        if value is None:
+            if nulls_last:
+                return Q(**{f"{name}__isnull": True}) & tie
+            return Q(**{f"{name}__isnull": False}) | (Q(**{f"{name}__isnull": True}) & tie)
+        after = Q(**{f"{name}__{op}": value}) | (Q(**{name: value}) & tie)
+        if nulls_last and self.field.null:
+            after |= Q(**{f"{name}__isnull": True})
+        return after
+
+    def _order_by(self, descending, nulls_last):
+        nulls = {"nulls_last": True} if nulls_last else {"nulls_first": True}
+        if not self.field.null:
+            nulls = {}
+        key = F(self.field.name).desc(**nulls) if descending else F(self.field.name).asc(**nulls)
+        return [key, "-id" if descending else "id"]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = self._concrete_field(queryset.model, self.ordering.lstrip("-"))
+        page_size = self.get_page_size(request)
+        descending = self.ordering.startswith("-")
+
+        position = self.decode_cursor(request)
+        reverse = bool(position and position[2])
+        # walking backwards flips both the direction and where NULLs sit
+        direction, nulls_last = (not descending, False) if reverse else (descending, True)
+        qs = queryset.order_by(*self._order_by(direction, nulls_last))
+        if position:
+            qs = qs.filter(self._after(position[0], position[1], direction, nulls_last))
+        rows = list(qs[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_link = self.previous_link = None
+        if rows:
+            if reverse:
+                self.next_link = self.encode_cursor(rows[-1], reverse=False)
+                self.previous_link = self.encode_cursor(rows[0], reverse=True) if has_more else None
+            else:
+                self.next_link = self.encode_cursor(rows[-1], reverse=False) if has_more else None
+                self.previous_link = self.encode_cursor(rows[0], reverse=True) if position else None
+
+        self.total = None
+        if request.query_params.get(self.total_query_param) in ("1", "true", "approx"):
+            self.total = approximate_count(queryset, getattr(settings, "API_COUNT_LIMIT", 10000))
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.next_link, "previous": self.previous_link}
+        if self.total is not None:
+            payload["total"], payload["total_approximate"] = self.total
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "total": {"type": "integer"},
+                "total_approximate": {"type": "boolean"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,147 @@
+# core/quiz_cache.py
+"""
+Pre-serialized quiz payloads.
+
+Every quiz has a content version token in the cache; saving or deleting the
+quiz or any of its questions replaces the token (see core.signals), which
+orphans the old payload. Payloads are stored with a strong ETag computed
+from their JSON so clients can revalidate with If-None-Match.
+
+The active quiz ids used by QuizViewSet.random are cached as well, grouped
+by audience with cumulative selection weights, and dropped whenever a quiz
+is saved or deleted.
+
+Attempts point at an immutable QuizSnapshot of the question set they were
+answered against. Snapshots are deduplicated by content hash and, being
+immutable, are cached without expiry.
+"""
+import hashlib
+import json
+import random
+import time
+from bisect import bisect_right
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .models import Quiz, QuizQuestion, QuizSnapshot
+from .serializers import QuizSerializer
+
+VERSION_KEY = "quiz:{id}:version"
+PAYLOAD_KEY = "quiz:{id}:payload:{version}"
+RANDOM_INDEX_KEY = "quiz:random-index"
+SNAPSHOT_POINTER_KEY = "quiz:{id}:snapshot:{version}"
+SNAPSHOT_KEY = "quiz-snapshot:{id}"
+
+SNAPSHOT_FIELDS = ("id", "question_text", "type", "options", "correct_answer", "weightage")
+
+
+def _payload_timeout():
+    return getattr(settings, "QUIZ_CACHE_SECONDS", 60 * 60)
+
+
+def quiz_version(quiz_id):
+    key = VERSION_KEY.format(id=quiz_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_quiz_version(quiz_id):
+    """Invalidate the cached payload of `quiz_id` once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(VERSION_KEY.format(id=quiz_id), time.time_ns(), timeout=None))
+
+
+def build_payload(quiz):
+    data = QuizSerializer(quiz).data
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+    return {
+        "data": data,
+        "etag": '"%s"' % hashlib.sha1(body.encode("utf-8")).hexdigest(),
+        "is_active": quiz.is_active,
+    }
+
+
+def get_quiz_payload(quiz_id):
+    """Return {"data", "etag", "is_active"} for a quiz (from cache when possible), or None."""
+    version = quiz_version(quiz_id)
+    key = PAYLOAD_KEY.format(id=quiz_id, version=version)
+    entry = cache.get(key)
+    if entry is None:
+        quiz = Quiz.objects.filter(pk=quiz_id).prefetch_related("questions").first()
+        if quiz is None:
+            return None
+        entry = build_payload(quiz)
+        cache.set(key, entry, timeout=_payload_timeout())
+    return entry
+
+
+def invalidate_random_index():
+    transaction.on_commit(lambda: cache.delete(RANDOM_INDEX_KEY))
+
+
+def build_random_index():
+    """
+    {audience: (ids, cumulative_weights)} for active quizzes, built with one query.
+    The "" entry holds every active quiz; quizzes without an audience are in every pool.
+    """
+    rows = list(
+        Quiz.objects.filter(is_active=True, selection_weight__gt=0)
+        .order_by("pk")
+        .values_list("pk", "audience", "selection_weight")
+    )
+    pools = {"": rows}
+    for audience, _ in Quiz.AUDIENCE_CHOICES:
+        pools[audience] = [r for r in rows if r[1] in (audience, "")]
+    return {
+        audience: ([r[0] for r in pool], list(accumulate(r[2] for r in pool)))
+        for audience, pool in pools.items()
+    }
+
+
+def random_quiz_id(audience=None, rng=random):
+    """Weighted random pick of an active quiz id (None if the pool is empty)."""
+    index = cache.get(RANDOM_INDEX_KEY)
+    if index is None:
+        index = build_random_index()
+        cache.set(RANDOM_INDEX_KEY, index, timeout=None)
+    ids, cumulative = index.get((audience or "").lower(), ((), ()))
+    if not ids:
+        return None
+    pick = bisect_right(cumulative, rng.random() * cumulative[-1])
+    return ids[min(pick, len(ids) - 1)]
+
+
+def current_snapshot_id(quiz_id):
+    """Id of the snapshot matching the quiz's current questions, creating it on first use."""
+    pointer_key = SNAPSHOT_POINTER_KEY.format(id=quiz_id, version=quiz_version(quiz_id))
+    snapshot_id = cache.get(pointer_key)
+    if snapshot_id is None:
+        questions = list(QuizQuestion.objects.filter(quiz_id=quiz_id).order_by("id").values(*SNAPSHOT_FIELDS))
+        body = json.dumps(questions, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+        snapshot, _ = QuizSnapshot.objects.get_or_create(
+            quiz_id=quiz_id,
+            content_hash=hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            defaults={"questions": questions},
+        )
+        snapshot_id = snapshot.pk
+        cache.set(pointer_key, snapshot_id, timeout=_payload_timeout())
+        cache.set(SNAPSHOT_KEY.format(id=snapshot_id), snapshot.questions, timeout=None)
+    return snapshot_id
+
+
+def get_snapshot_questions(snapshot_id):
+    """Question list of an immutable snapshot (None if it does not exist)."""
+    key = SNAPSHOT_KEY.format(id=snapshot_id)
+    questions = cache.get(key)
+    if questions is None:
+        questions = QuizSnapshot.objects.filter(pk=snapshot_id).values_list("questions", flat=True).first()
+        if questions is None:
+            return None
+        cache.set(key, questions, timeout=None)
+    return questions
@@ -0,0 +1,153 @@
+# core/quiz_import.py
+"""
+Bulk, idempotent import of quizzes and their questions.
+
+Callers describe what the quizzes should contain as plain dicts:
+
+    {"title": ..., "defaults": {...}, "questions": [{question_text, type, options,
+                                                    correct_answer, weightage}, ...]}
+
+or {"quiz_id": ..., "questions": [...]} to target an existing quiz. Existing
+questions of every target quiz are loaded in one query and matched by
+(quiz, question_text); a content hash of the remaining fields decides
+whether a row is new, changed or untouched. All writes happen through
+bulk_create / bulk_update inside a single transaction, so an import either
+lands completely or not at all. Questions missing from the source are left
+alone (attempts may still reference them). Streamed sources are fed in
+fixed-size batches that share one ImportResult.
+
+Bulk writes do not send post_save, so the quiz cache invalidation that
+core.signals would normally do is triggered here for every quiz touched.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .models import Quiz, QuizQuestion
+from .quiz_cache import bump_quiz_version, invalidate_random_index
+from .versions import bump_model_versions
+
+QUESTION_FIELDS = ("type", "options", "correct_answer", "weightage")
+
+
+def clean_question(data):
+    """Coerce a source question dict to model field values (raises KeyError without question_text)."""
+    correct = data.get("correct_answer")
+    weightage = data.get("weightage")
+    return {
+        "question_text": str(data["question_text"]).strip(),
+        "type": data.get("type") or "mcq",
+        "options": data.get("options"),
+        "correct_answer": None if correct in (None, "") else str(correct)[:255],
+        "weightage": 1.0 if weightage is None else float(weightage),
+    }
+
+
+def content_hash(values):
+    body = json.dumps([values[f] for f in QUESTION_FIELDS], cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+class ImportResult:
+    def __init__(self, record_diff=True):
+        # per-question diff lines grow with the input, so streamed imports only keep them for dry runs
+        self.record_diff = record_diff
+        self.created_quizzes = []    # titles
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.missing_quizzes = []    # quiz ids that do not exist
+        self.lines = []
+
+    def note(self, line):
+        if self.record_diff:
+            self.lines.append(line)
+
+    def diff_lines(self):
+        return [f"+ quiz {title}" for title in self.created_quizzes] + self.lines
+
+    def summary(self):
+        return (
+            f"{len(self.created_quizzes)} quizzes created; questions: {self.created} created, "
+            f"{self.updated} updated, {self.unchanged} unchanged."
+        )
+
+
+def import_quizzes(specs, dry_run=False, batch_size=500, result=None):
+    """
+    Apply `specs`; pass the same `result` to several calls to import a stream batch by batch.
+    Batches no larger than `batch_size` only load the existing questions whose text they carry.
+    """
+    specs = list(specs)
+    result = result if result is not None else ImportResult()
+
+    with transaction.atomic():
+        by_id = Quiz.objects.in_bulk([s["quiz_id"] for s in specs if s.get("quiz_id") is not None])
+        by_title = {}
+        for quiz in Quiz.objects.filter(title__in=[s["title"] for s in specs if s.get("quiz_id") is None]).order_by("pk"):
+            by_title.setdefault(quiz.title, quiz)
+
+        targets, new_quizzes = [], []
+        for spec in specs:
+            if spec.get("quiz_id") is not None:
+                quiz = by_id.get(spec["quiz_id"])
+                if quiz is None:
+                    result.missing_quizzes.append(spec["quiz_id"])
+                    continue
+            else:
+                quiz = by_title.get(spec["title"])
+                if quiz is None:
+                    quiz = by_title[spec["title"]] = Quiz(title=spec["title"], **spec.get("defaults", {}))
+                    new_quizzes.append(quiz)
+                    # in a dry run the same new quiz shows up again in every batch
+                    if quiz.title not in result.created_quizzes:
+                        result.created_quizzes.append(quiz.title)
+            targets.append((quiz, spec["questions"]))
+
+        if new_quizzes and not dry_run:
+            Quiz.objects.bulk_create(new_quizzes)
+
+        existing_rows = QuizQuestion.objects.filter(quiz_id__in=[q.pk for q, _ in targets if q.pk])
+        texts = {values["question_text"] for _, questions in targets for values in questions}
+        if len(texts) <= batch_size:
+            existing_rows = existing_rows.filter(question_text__in=texts)
+        existing = {}
+        for row in existing_rows.order_by("pk"):
+            existing.setdefault((row.quiz_id, row.question_text), row)
+
+        to_create, to_update, touched, seen = [], [], {}, set()
+        for quiz, questions in targets:
+            for values in questions:
+                key = (id(quiz), values["question_text"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                row = existing.get((quiz.pk, values["question_text"])) if quiz.pk else None
+                if row is None:
+                    to_create.append(QuizQuestion(quiz=quiz, **values))
+                    result.created += 1
+                    result.note(f"+ [{quiz.title}] {values['question_text'][:70]}")
+                elif content_hash(values) != content_hash({f: getattr(row, f) for f in QUESTION_FIELDS}):
+                    changed = [f for f in QUESTION_FIELDS if getattr(row, f) != values[f]]
+                    for f in changed:
+                        setattr(row, f, values[f])
+                    to_update.append(row)
+                    result.updated += 1
+                    result.note(f"~ [{quiz.title}] {values['question_text'][:70]} ({', '.join(changed)})")
+                else:
+                    result.unchanged += 1
+                    continue
+                touched[id(quiz)] = quiz
+
+        if not dry_run:
+            QuizQuestion.objects.bulk_create(to_create, batch_size=batch_size)
+            QuizQuestion.objects.bulk_update(to_update, QUESTION_FIELDS, batch_size=batch_size)
+            for quiz in {**touched, **{id(q): q for q in new_quizzes}}.values():
+                bump_quiz_version(quiz.pk)
+            if new_quizzes:
+                invalidate_random_index()
+            if touched or new_quizzes:
+                bump_model_versions(Quiz, QuizQuestion)
+    return result
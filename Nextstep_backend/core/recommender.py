@@ -0,0 +1,184 @@
+# core/recommender.py
+"""
+Item-item collaborative filtering trained from the Interaction log.
+
+Items are (content_type, object_id) pairs packed into one int64 key. Training
+builds a sparse items x users matrix of interaction weights, L2-normalises the
+rows and multiplies it by its transpose block by block, keeping only the top-K
+neighbours of every item. Peak memory is bounded by the block size rather
+than by the number of items squared.
+"""
+from array import array
+
+import numpy as np
+from scipy import sparse
+from django.db.models import Case, FloatField, Sum, Value, When
+
+from .models import Interaction
+
+# Relative strength of each interaction type; dismissals are handled separately
+INTERACTION_WEIGHTS = {
+    "view": 1.0,
+    "like": 2.0,
+    "share": 2.0,
+    "save": 3.0,
+    "apply": 4.0,
+}
+
+
+def pack_item(content_type_id, object_id):
+    return (np.asarray(content_type_id, dtype=np.int64) << 32) | np.asarray(object_id, dtype=np.int64)
+
+
+def unpack_items(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    return keys >> 32, keys & 0xFFFFFFFF
+
+
+class InteractionMatrix:
+    """Sparse items x users weight matrix plus the id arrays its rows/columns map to."""
+
+    def __init__(self, matrix, item_keys, user_ids, dismissed):
+        self.matrix = matrix          # csr, shape (n_items, n_users)
+        self.item_keys = item_keys    # packed (content_type_id, object_id) per row
+        self.user_ids = user_ids      # accounts.User id per column
+        self.dismissed = dismissed    # csr bool, shape (n_users, n_items)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+
+def load_interaction_matrix(chunk_size=10000):
+    """
+    Stream per-(user, item) summed weights out of the database (the GROUP BY runs
+    in SQL) into compact typed arrays and build the sparse matrix from them.
+    """
+    weight = Sum(
+        Case(
+            *[When(interaction_type=t, then=Value(w)) for t, w in INTERACTION_WEIGHTS.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
+    rows = (
+        Interaction.objects.filter(interaction_type__in=list(INTERACTION_WEIGHTS))
+        .values("user_id", "content_type_id", "object_id")
+        .annotate(w=weight)
+        .order_by()
+        .values_list("user_id", "content_type_id", "object_id", "w")
+        .iterator(chunk_size=chunk_size)
+    )
+    users, cts, oids, weights = array("q"), array("q"), array("q"), array("d")
+    for user_id, ct_id, object_id, w in rows:
+        users.append(user_id)
+        cts.append(ct_id)
+        oids.append(object_id)
+        weights.append(w)
+
+    dismissed = array("q"), array("q"), array("q")
+    for user_id, ct_id, object_id in (
+        Interaction.objects.filter(interaction_type="dismiss")
+        .values_list("user_id", "content_type_id", "object_id")
+        .distinct()
+        .iterator(chunk_size=chunk_size)
+    ):
+        dismissed[0].append(user_id)
+        dismissed[1].append(ct_id)
+        dismissed[2].append(object_id)
+
+    return build_interaction_matrix(
+        np.frombuffer(users, dtype=np.int64),
+        pack_item(np.frombuffer(cts, dtype=np.int64), np.frombuffer(oids, dtype=np.int64)),
+        np.frombuffer(weights, dtype=np.float64),
+        dismissed_users=np.frombuffer(dismissed[0], dtype=np.int64),
+        dismissed_items=pack_item(np.frombuffer(dismissed[1], dtype=np.int64), np.frombuffer(dismissed[2], dtype=np.int64)),
+    )
+
+
+def build_interaction_matrix(users, items, weights, dismissed_users=None, dismissed_items=None):
+    """Build an InteractionMatrix from parallel arrays (duplicates are summed)."""
+    item_keys, item_idx = np.unique(items, return_inverse=True)
+    user_ids, user_idx = np.unique(users, return_inverse=True)
+    # dampen heavy repeat usage so a single binge does not dominate similarities
+    matrix = sparse.csr_matrix(
+        (np.log1p(np.maximum(weights, 0.0)), (item_idx, user_idx)),
+        shape=(len(item_keys), len(user_ids)),
+    )
+    matrix.sum_duplicates()
+    matrix.eliminate_zeros()
+
+    dismissed = sparse.csr_matrix((len(user_ids), len(item_keys)), dtype=bool)
+    if dismissed_users is not None and len(dismissed_users):
+        u = np.searchsorted(user_ids, dismissed_users)
+        i = np.searchsorted(item_keys, dismissed_items)
+        known = (u < len(user_ids)) & (i < len(item_keys))
+        known[known] &= (user_ids[u[known]] == dismissed_users[known]) & (item_keys[i[known]] == dismissed_items[known])
+        dismissed = sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=bool), (u[known], i[known])),
+            shape=(len(user_ids), len(item_keys)),
+        )
+    return InteractionMatrix(matrix, item_keys, user_ids, dismissed)
+
+
+def _row_top_k(indptr, indices, data, row, k, exclude=None):
+    start, end = indptr[row], indptr[row + 1]
+    cols, vals = indices[start:end], data[start:end]
+    if exclude is not None and len(exclude):
+        keep = ~np.isin(cols, exclude, assume_unique=False)
+        cols, vals = cols[keep], vals[keep]
+    keep = vals > 0
+    cols, vals = cols[keep], vals[keep]
+    if len(vals) > k:
+        part = np.argpartition(-vals, k)[:k]
+        cols, vals = cols[part], vals[part]
+    order = np.lexsort((cols, -vals))
+    return cols[order], vals[order]
+
+
+def item_neighbors(data, k=20, block_size=2048):
+    """
+    Cosine top-K neighbours for every item.
+    Returns a csr matrix (n_items x n_items) holding only the kept similarities.
+    """
+    matrix = data.matrix
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    inv = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    normalized = sparse.diags(inv) @ matrix
+    normalized_t = normalized.T.tocsr()
+
+    src, dst, score = array("q"), array("q"), array("d")
+    n_items = matrix.shape[0]
+    for start in range(0, n_items, block_size):
+        block = (normalized[start:start + block_size] @ normalized_t).tocsr()
+        for offset in range(block.shape[0]):
+            row = start + offset
+            cols, vals = _row_top_k(block.indptr, block.indices, block.data, offset, k, exclude=np.array([row]))
+            src.extend([row] * len(cols))
+            dst.extend(cols.tolist())
+            score.extend(vals.tolist())
+
+    return sparse.csr_matrix(
+        (np.frombuffer(score, dtype=np.float64), (np.frombuffer(src, dtype=np.int64), np.frombuffer(dst, dtype=np.int64))),
+        shape=(n_items, n_items),
+    )
+
+
+def user_recommendations(data, neighbors, n=20, block_size=2048):
+    """
+    Score unseen items for every user as sum(weight(user, seen) * sim(seen, item)).
+    Yields (user_index, item_indices, scores) per user.
+    """
+    users_items = data.matrix.T.tocsr()
+    for start in range(0, users_items.shape[0], block_size):
+        seen = users_items[start:start + block_size]
+        scores = (seen @ neighbors).tocsr()
+        dismissed = data.dismissed[start:start + block_size]
+        for offset in range(scores.shape[0]):
+            exclude = np.concatenate([
+                seen.indices[seen.indptr[offset]:seen.indptr[offset + 1]],
+                dismissed.indices[dismissed.indptr[offset]:dismissed.indptr[offset + 1]],
+            ])
+            cols, vals = _row_top_k(scores.indptr, scores.indices, scores.data, offset, n, exclude=exclude)
+            if len(cols):
+                yield start + offset, cols, vals
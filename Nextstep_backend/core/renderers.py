@@ -0,0 +1,36 @@
+# core/renderers.py
+"""
+JSON renderer backed by orjson when it is installed (optional dependency).
+
+Output matches rest_framework's JSONRenderer with the default settings
+(compact, UTF-8, U+2028/U+2029 escaped); types orjson does not handle the
+same way (datetimes, Decimal, lazy strings, querysets) go through DRF's own
+encoder. Floats are numerically identical, though very large or very small
+ones may spell their exponent differently (1e16 rather than 1e+16).
+Pretty-printed requests (?indent / the browsable API) use the stock renderer.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - plain json is used instead
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS,
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
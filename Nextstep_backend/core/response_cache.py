@@ -0,0 +1,75 @@
+# core/response_cache.py
+"""
+Server-side cache for GET responses of the catalog endpoints.
+
+Entries are keyed on the request (path, normalized query string, anonymous
+vs authenticated) and on the change counters of the view's models
+(core.versions), so a write never has to find and delete the responses it
+affects: it bumps the counter and every key built afterwards is new. Old
+entries simply expire after RESPONSE_CACHE_SECONDS. That only holds when the
+cache is shared by every process, so a per-process backend disables it.
+
+On a miss only one process rebuilds a given key; the others wait up to
+RESPONSE_CACHE_WAIT_SECONDS for its result before building it themselves,
+so a popular list does not hit the database once per concurrent request
+right after a write.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .versions import shared_cache
+
+RESPONSE_KEY = "response:{digest}"
+LOCK_KEY = "response-lock:{digest}"
+
+
+def cache_seconds():
+    # a per-process cache would keep serving entries other processes have invalidated
+    if not shared_cache():
+        return 0
+    return getattr(settings, "RESPONSE_CACHE_SECONDS", 300)
+
+
+def response_key(request, generation):
+    """Cache key for a GET `request` against the model `generation` token."""
+    params = sorted((name, value) for name in request.query_params for value in request.query_params.getlist(name))
+    audience = "user" if request.user and request.user.is_authenticated else "anon"
+    token = "|".join([request.build_absolute_uri(request.path), repr(params), audience, generation])
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()
+
+
+def get_or_build(digest, build):
+    """
+    (value, hit) for `digest`. build() returns (value, store); values it does
+    not want stored (errors, redirects) are handed back without caching.
+    """
+    key = RESPONSE_KEY.format(digest=digest)
+    value = cache.get(key)
+    if value is not None:
+        return value, True
+
+    lock = LOCK_KEY.format(digest=digest)
+    wait = getattr(settings, "RESPONSE_CACHE_WAIT_SECONDS", 2)
+    owner = cache.add(lock, 1, timeout=max(1, int(wait) + 1))
+    if not owner:
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            found = cache.get_many([key, lock])
+            if key in found:
+                return found[key], True
+            if lock not in found:
+                break  # built but not stored (an error response)
+        # otherwise the builder is slow or gone: build without the lock
+
+    try:
+        value, store = build()
+        if store:
+            cache.set(key, value, timeout=cache_seconds())
+    finally:
+        if owner:
+            cache.delete(lock)
+    return value, False
@@ -0,0 +1,189 @@
+# core/scoring.py
+"""
+Server-side quiz scoring.
+
+A quiz is compiled once into parallel numpy arrays (answer key, weight,
+scoring kind and scale per question). Attempts are encoded into rows of
+floats and scored with vectorized comparisons, so one attempt or thousands
+cost the same handful of array operations.
+
+Scores are a weighted percentage (0-100) over the questions that have a
+correct_answer; questions without a key (e.g. free text) do not count.
+"""
+from functools import lru_cache
+from types import SimpleNamespace
+
+import numpy as np
+
+from .models import QuizQuestion, QuizSnapshot
+from .quiz_cache import get_snapshot_questions
+
+KIND_NONE = 0      # not scored
+KIND_EXACT = 1     # mcq: full credit on the keyed option only
+KIND_DISTANCE = 2  # likert/slider: partial credit by distance to the key
+
+
+def _as_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _option_lookup(options):
+    """Map every way a client may refer to an option (id, text, index) to its index."""
+    lookup = {}
+    if isinstance(options, list):
+        for index, option in enumerate(options):
+            lookup[str(index)] = index
+            if isinstance(option, dict):
+                for key in ("id", "value", "text", "label"):
+                    if option.get(key) is not None:
+                        lookup[str(option[key]).strip().lower()] = index
+            elif option is not None:
+                lookup[str(option).strip().lower()] = index
+    return lookup
+
+
+def _scale_span(question, lookup):
+    options = question.options
+    if isinstance(options, dict):
+        low, high = _as_number(options.get("min")), _as_number(options.get("max"))
+        if low is not None and high is not None and high > low:
+            return high - low
+    if isinstance(options, list) and len(options) > 1:
+        numbers = [_as_number(o) for o in options]
+        if all(n is not None for n in numbers):
+            return max(numbers) - min(numbers)
+        return float(len(options) - 1)
+    return None
+
+
+class CompiledQuiz:
+    """Array-backed answer key for one quiz."""
+
+    def __init__(self, questions):
+        questions = list(questions)
+        self.question_ids = [str(q.id) for q in questions]
+        self.index = {qid: i for i, qid in enumerate(self.question_ids)}
+        n = len(questions)
+        self.kinds = np.zeros(n, dtype=np.int8)
+        self.keys = np.full(n, np.nan)
+        self.spans = np.ones(n)
+        self.weights = np.zeros(n)
+        self.lookups = []
+        self.numeric = np.zeros(n, dtype=bool)
+
+        for i, q in enumerate(questions):
+            lookup = _option_lookup(q.options)
+            self.lookups.append(lookup)
+            if q.correct_answer in (None, "") or q.type == "text":
+                continue
+            if q.type in ("likert", "slider"):
+                span = _scale_span(q, lookup)
+                self.numeric[i] = True
+                key = self._encode_value(i, q.correct_answer)
+                if key is None:
+                    continue
+                self.kinds[i] = KIND_DISTANCE if span else KIND_EXACT
+                self.spans[i] = span or 1.0
+            else:
+                key = self._encode_value(i, q.correct_answer)
+                if key is None:
+                    continue
+                self.kinds[i] = KIND_EXACT
+            self.keys[i] = key
+            self.weights[i] = max(q.weightage or 0.0, 0.0)
+
+        self.total_weight = float(self.weights.sum())
+
+    @classmethod
+    def for_quiz(cls, quiz_id):
+        return cls(QuizQuestion.objects.filter(quiz_id=quiz_id).order_by("id"))
+
+    @classmethod
+    def from_dicts(cls, questions):
+        """Compile from plain question dicts, e.g. QuizSnapshot.questions."""
+        return cls(SimpleNamespace(**q) for q in questions)
+
+    def _encode_value(self, i, value):
+        if value is None:
+            return None
+        if isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+            if value is None:
+                return None
+        if isinstance(value, dict):
+            value = value.get("id", value.get("value", value.get("text")))
+        lookup = self.lookups[i]
+        if self.numeric[i]:
+            number = _as_number(value)
+            if number is not None:
+                return number
+        return lookup.get(str(value).strip().lower())
+
+    def encode(self, answers):
+        """Turn {"question_id": answer} into a float row (NaN = unanswered/unknown option)."""
+        row = np.full(len(self.question_ids), np.nan)
+        for qid, value in (answers or {}).items():
+            i = self.index.get(str(qid))
+            if i is None:
+                continue
+            encoded = self._encode_value(i, value)
+            if encoded is not None:
+                row[i] = encoded
+        return row
+
+    def answered(self, answers):
+        """Whether `answers` names at least one question of this quiz (unanswered attempts get no score)."""
+        return any(str(qid) in self.index for qid in answers or {})
+
+    def score_matrix(self, rows):
+        """Score an (attempts x questions) matrix at once; returns percentages."""
+        rows = np.atleast_2d(rows)
+        if not self.total_weight:
+            return np.full(rows.shape[0], np.nan)
+        with np.errstate(invalid="ignore"):
+            exact = (rows == self.keys).astype(float)
+            distance = np.clip(1.0 - np.abs(rows - self.keys) / self.spans, 0.0, 1.0)
+        credit = np.where(self.kinds == KIND_EXACT, exact, np.where(self.kinds == KIND_DISTANCE, distance, 0.0))
+        credit = np.nan_to_num(credit, nan=0.0)
+        return np.round(credit @ self.weights / self.total_weight * 100.0, 2)
+
+    def score(self, answers):
+        """Score a single attempt's answers dict; None when it answers none of the quiz's questions or none are keyed."""
+        if not self.answered(answers):
+            return None
+        value = self.score_matrix(self.encode(answers))[0]
+        return None if np.isnan(value) else float(value)
+
+
+@lru_cache(maxsize=256)
+def _compile_snapshot(snapshot_id):
+    questions = get_snapshot_questions(snapshot_id)
+    if questions is None:
+        # raised, not returned, so lru_cache does not remember the miss
+        raise QuizSnapshot.DoesNotExist(snapshot_id)
+    return CompiledQuiz.from_dicts(questions)
+
+
+def compiled_for_snapshot(snapshot_id):
+    """
+    Compiled key of a snapshot, or None if there is no such snapshot (yet).
+    Snapshots never change, so a found one is kept for the life of the process.
+    """
+    try:
+        return _compile_snapshot(snapshot_id)
+    except QuizSnapshot.DoesNotExist:
+        return None
+
+
+def compiled_for(quiz_id, snapshot_id=None):
+    """The snapshot's key when it exists, else the quiz's live questions."""
+    return (snapshot_id and compiled_for_snapshot(snapshot_id)) or CompiledQuiz.for_quiz(quiz_id)
+
+
+def score_attempt(attempt, compiled=None):
+    if compiled is None:
+        compiled = compiled_for(attempt.quiz_id, attempt.snapshot_id)
+    return compiled.score(attempt.answers)
@@ -1,14 +1,80 @@
 # core/serializers.py
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import (
-    Tag, Skill, Career, Resource, Multimedia,
+    Tag, Skill, Career, Resource, Multimedia, MultimediaRating,
     SuccessStory, UserProfile, Feedback,
-    Quiz, QuizQuestion, QuizAttempt, Interaction
+    Quiz, QuizQuestion, QuizSnapshot, QuizAttempt, Interaction,
+    InteractionDailyStat, ItemNeighbor, UserRecommendation, CohortAnswerStat
 )
 
 User = get_user_model()
 
+def _param_names(request, name):
+    raw = request.query_params.get(name)
+    if raw is None:
+        return None
+    return {n.strip() for n in raw.split(",") if n.strip()}
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    ManyRelatedField that resolves every submitted pk with one in_bulk() query
+    instead of one get() per item, and reports each bad id rather than the first.
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk = queryset.model._meta.pk
+        ids, errors = [], []
+        for item in data:
+            value = child.pk_field.to_internal_value(item) if child.pk_field is not None else item
+            try:
+                if isinstance(value, bool):
+                    raise TypeError
+                ids.append(pk.to_python(value))
+            except (TypeError, ValueError, DjangoValidationError):
+                errors.append(child.error_messages["incorrect_type"].format(data_type=type(value).__name__))
+        found = queryset.in_bulk(set(ids)) if ids else {}
+        errors += [child.error_messages["does_not_exist"].format(pk_value=i) for i in ids if i not in found]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return [found[i] for i in ids]
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField whose many=True form validates all ids in one query."""
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets on reads: ?fields=title,tags keeps only those fields (plus id),
+    ?omit=content_text,transcript drops them. Unknown names are ignored, and
+    writes always see every field.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD"):
+            return
+        wanted, omitted = _param_names(request, "fields"), _param_names(request, "omit")
+        for name in list(self.fields):
+            if name == "id":
+                continue
+            if (wanted is not None and name not in wanted) or (omitted and name in omitted):
+                self.fields.pop(name)
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
@@ -19,9 +85,9 @@ class SkillSerializer(serializers.ModelSerializer):
         model = Skill
         fields = ("id", "name")
 
-class CareerSerializer(serializers.ModelSerializer):
-    required_skills = serializers.PrimaryKeyRelatedField(many=True, queryset=Skill.objects.all(), required=False)
-    tags = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
+class CareerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    required_skills = BulkPrimaryKeyRelatedField(many=True, queryset=Skill.objects.all(), required=False)
+    tags = BulkPrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
 
     class Meta:
         model = Career
@@ -32,8 +98,8 @@ class CareerSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("created_at", "updated_at")
 
-class ResourceSerializer(serializers.ModelSerializer):
-    tags = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
+class ResourceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    tags = BulkPrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
     created_by = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -41,30 +107,38 @@ class ResourceSerializer(serializers.ModelSerializer):
         fields = ("id","title","category","description","file","tags","views_count","created_by","created_at","content_text","embedding_id")
         read_only_fields = ("views_count","created_by","created_at")
 
-class MultimediaSerializer(serializers.ModelSerializer):
-    tags = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
+class MultimediaSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    tags = BulkPrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
     created_by = serializers.StringRelatedField(read_only=True)
 
     class Meta:
         model = Multimedia
-        fields = ("id","title","type","url","uploaded_file","tags","transcript","rating_avg","rating_count","created_by","created_at","content_text","embedding_id")
-        read_only_fields = ("rating_avg","rating_count","created_by","created_at")
+        fields = ("id","title","type","url","uploaded_file","tags","transcript","rating_avg","rating_count","views_count","created_by","created_at","content_text","embedding_id")
+        read_only_fields = ("rating_avg","rating_count","views_count","created_by","created_at")
 
-class SuccessStorySerializer(serializers.ModelSerializer):
+class MultimediaRatingSerializer(serializers.ModelSerializer):
+    score = serializers.IntegerField(min_value=MultimediaRating.SCORE_MIN, max_value=MultimediaRating.SCORE_MAX)
+
+    class Meta:
+        model = MultimediaRating
+        fields = ("id","multimedia","score","created_at","updated_at")
+        read_only_fields = ("multimedia","created_at","updated_at")
+
+class SuccessStorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     submitted_by = serializers.StringRelatedField(read_only=True)
     approved_by = serializers.StringRelatedField(read_only=True)
 
     class Meta:
         model = SuccessStory
-        fields = ("id","title","domain","story_text","image","submitted_by","approved_by","approved_at","submitted_at","is_approved","content_text","embedding_id")
-        read_only_fields = ("submitted_by","approved_by","approved_at","submitted_at")
+        fields = ("id","title","domain","story_text","image","submitted_by","approved_by","approved_at","submitted_at","is_approved","views_count","content_text","embedding_id")
+        read_only_fields = ("submitted_by","approved_by","approved_at","submitted_at","views_count")
 
 from accounts.serializers import UserSerializer
 
 class UserProfileSerializer(serializers.ModelSerializer):
     # Nest the full user details for reading
     user = UserSerializer(read_only=True)
-    interests = serializers.PrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
+    interests = BulkPrimaryKeyRelatedField(many=True, queryset=Tag.objects.all(), required=False)
 
     # Add fields to update the related User model
     first_name = serializers.CharField(source='user.first_name', required=False, allow_blank=True)
@@ -155,16 +229,34 @@ class QuizSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Quiz
-        fields = ("id","title","description","is_active","created_at","questions")
+        fields = ("id","title","description","is_active","audience","selection_weight","created_at","questions")
         read_only_fields = ("created_at","questions")
 
+class QuizSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = QuizSnapshot
+        fields = ("id","quiz","content_hash","questions","created_at")
+        read_only_fields = fields
+
 class QuizAttemptSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
         model = QuizAttempt
-        fields = ("id","user","quiz","score","started_at","completed_at","answers")
-        read_only_fields = ("user","started_at")
+        fields = ("id","user","quiz","snapshot","score","started_at","completed_at","answers")
+        # the snapshot is pinned when the attempt is created; score is set server-side when answers are submitted
+        read_only_fields = ("user","snapshot","score","started_at")
+
+    def validate_answers(self, value):
+        """Answers are {"<question id>": answer}; anything else cannot be scored."""
+        if value is None:
+            return value
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Expected an object keyed by question id, e.g. {"12": "Yes"}.')
+        bad = [key for key in value if not str(key).isdigit()]
+        if bad:
+            raise serializers.ValidationError(f"Not question ids: {', '.join(map(str, bad[:5]))}.")
+        return value
 
 class InteractionSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
@@ -176,3 +268,34 @@ class InteractionSerializer(serializers.ModelSerializer):
         model = Interaction
         fields = ("id","user","content_type","object_id","interaction_type","metadata","created_at","content_type_id")
         read_only_fields = ("user","content_type","created_at")
+
+class InteractionDailyStatSerializer(serializers.ModelSerializer):
+    content_type = serializers.StringRelatedField(read_only=True)
+
+    class Meta:
+        model = InteractionDailyStat
+        fields = ("id","day","content_type","object_id","interaction_type","count")
+        read_only_fields = fields
+
+class ItemNeighborSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="neighbor_content_type.model", read_only=True)
+    object_id = serializers.IntegerField(source="neighbor_object_id", read_only=True)
+
+    class Meta:
+        model = ItemNeighbor
+        fields = ("type","object_id","score","rank")
+        read_only_fields = fields
+
+class UserRecommendationSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="content_type.model", read_only=True)
+
+    class Meta:
+        model = UserRecommendation
+        fields = ("type","object_id","score","rank")
+        read_only_fields = fields
+
+class CohortAnswerStatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CohortAnswerStat
+        fields = ("id","quiz","question","option","role","education_level","week","count")
+        read_only_fields = fields
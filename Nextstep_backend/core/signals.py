@@ -1,12 +1,68 @@
+# core/signals.py
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from .models import Interaction, Career
-from django.http import      request
-
-career = Career.objects.first()
-Interaction.objects.create(
-    user=request.user,
-    content_type=ContentType.objects.get_for_model(career),
-    object_id=career.id,
-    interaction_type="view",
-    metadata={"duration_seconds": 12.5, "session": "abc123", "device": "mobile", "referrer": "/home"}
-)
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cohorts import retract_attempt
+from .models import Interaction, Quiz, QuizAttempt, QuizQuestion, UserProfile
+from .quiz_cache import bump_quiz_version, invalidate_random_index
+from .trending import tracker
+from .versions import VERSIONED_MODELS, bump_model_versions
+
+
+@receiver(post_save, sender=Interaction)
+def track_trending_interaction(sender, instance, created, **kwargs):
+    """Feed every new interaction into the in-memory trending counters."""
+    if not created:
+        return
+    content_type = ContentType.objects.get_for_id(instance.content_type_id)
+    tracker.record(content_type.model, instance.object_id, instance.interaction_type, ts=instance.created_at.timestamp())
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """Every user gets their profile at signup, so profile reads never have to create one."""
+    if created and not raw:
+        UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(pre_delete, sender=QuizAttempt)
+def retract_deleted_attempt(sender, instance, **kwargs):
+    """Take a deleted attempt's folded answers out of the cohort cube (also on user / quiz cascades)."""
+    retract_attempt(instance)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz_payload(sender, instance, **kwargs):
+    bump_quiz_version(instance.pk)
+    invalidate_random_index()
+
+
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def invalidate_quiz_payload_for_question(sender, instance, **kwargs):
+    bump_quiz_version(instance.quiz_id)
+
+
+def bump_version_on_change(sender, **kwargs):
+    bump_model_versions(sender)
+
+
+def _bump_owner_on_m2m(owner):
+    def receiver(sender, action, **kwargs):
+        if action in ("post_add", "post_remove", "post_clear"):
+            bump_model_versions(owner)
+    return receiver
+
+
+# conditional GET validators (core.versions) follow every catalog write
+for _model in VERSIONED_MODELS:
+    post_save.connect(bump_version_on_change, sender=_model, dispatch_uid=f"version:save:{_model._meta.label_lower}")
+    post_delete.connect(bump_version_on_change, sender=_model, dispatch_uid=f"version:delete:{_model._meta.label_lower}")
+    for _field in _model._meta.many_to_many:
+        m2m_changed.connect(
+            _bump_owner_on_m2m(_model), sender=_field.remote_field.through, weak=False,
+            dispatch_uid=f"version:m2m:{_model._meta.label_lower}.{_field.name}",
+        )
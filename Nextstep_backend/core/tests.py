@@ -1,3 +1,247 @@
-from django.test import TestCase
+import io
+import json
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .cohorts import retract_attempt
+from .json_stream import iter_keys, iter_records
+from .models import Career, CohortAnswerStat, Quiz, QuizAnswer, QuizAttempt, QuizQuestion
+from .scoring import CompiledQuiz
+
+# per-process cache: no response caching or validators, and nothing leaks between tests
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _silent(*args, **kwargs):
+    call_command(*args, stdout=io.StringIO(), stderr=io.StringIO(), **kwargs)
+
+
+class JsonStreamTests(SimpleTestCase):
+    doc = {
+        "careerBank": [{"careerName": 'A "quoted" [x] {y}', "averageSalary": 1.5e3}],
+        "skipped": {"nested": [[1, 2, {"k": "]}"}]], "s": '\\"}', "t": "ends with a backslash \\"},
+        "quizQuestions": {
+            "student": [
+                {"question": "Back\\slash", "options": ["a", "b"]},
+                {"question": "ünïcode ✓", "n": -12.75, "e": 6.02e23},
+            ],
+            "graduate": [],
+            "professional": [{"question": "last", "flags": [True, False, None]}],
+        },
+        "successStories": [True, False, None, 123456789, "x"],
+    }
+
+    def _texts(self):
+        yield json.dumps(self.doc)
+        yield json.dumps(self.doc, ensure_ascii=False, indent=2)
+
+    def _expected(self, path):
+        """What iter_records should yield, computed from json.load."""
+        out = [((), self.doc)]
+        for part in path:
+            nxt = []
+            for keys, node in out:
+                for key, value in node.items():
+                    if part in ("*", key):
+                        nxt.append((keys + (key,), value))
+            out = nxt
+        return [(keys, item) for keys, items in out for item in items]
+
+    def test_matches_json_load_at_every_chunk_size(self):
+        for text in self._texts():
+            for path in [("quizQuestions", "*"), ("careerBank",), ("successStories",)]:
+                expected = self._expected(path)
+                for chunk_size in [1, 2, 3, 5, 7, 11, 64 * 1024]:
+                    with self.subTest(path=path, chunk_size=chunk_size, indent="\n" in text):
+                        got = list(iter_records(io.StringIO(text), path, chunk_size=chunk_size))
+                        self.assertEqual(got, expected)
+
+    def test_iter_keys(self):
+        for text in self._texts():
+            for chunk_size in [1, 4, 64 * 1024]:
+                self.assertEqual(list(iter_keys(io.StringIO(text), chunk_size=chunk_size)), list(self.doc))
+
+    def test_truncated_document_raises(self):
+        text = json.dumps(self.doc)
+        for cut in [1, 5, len(text) // 2]:
+            with self.subTest(cut=cut), self.assertRaises(ValueError):
+                list(iter_records(io.StringIO(text[:-cut]), ("quizQuestions", "*"), chunk_size=3))
+
+
+@override_settings(CACHES=LOCMEM, API_PAGE_SIZE=3)
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        salaries = [50000, None, 70000, 50000, None, 30000, 70000, 90000, None, 50000]
+        cls.careers = [
+            Career.objects.create(title=f"Career {i}", expected_salary=None if s is None else Decimal(s))
+            for i, s in enumerate(salaries)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _expected(self, descending):
+        """(salary, id) order with NULLs last in both directions."""
+        priced = [c for c in self.careers if c.expected_salary is not None]
+        unpriced = [c for c in self.careers if c.expected_salary is None]
+        priced.sort(key=lambda c: (c.expected_salary, c.pk), reverse=descending)
+        unpriced.sort(key=lambda c: c.pk, reverse=descending)
+        return [c.pk for c in priced + unpriced]
+
+    def _walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row["id"] for row in response.data["results"]])
+            url = response.data[link]
+        return pages, response
+
+    def test_forward_and_backward_cursors(self):
+        for ordering in ("expected_salary", "-expected_salary"):
+            with self.subTest(ordering=ordering):
+                expected = self._expected(ordering.startswith("-"))
+                forward, last = self._walk(f"/api/core/careers/?ordering={ordering}", "next")
+                self.assertEqual(sum(forward, []), expected)
+                self.assertTrue(all(len(page) == 3 for page in forward[:-1]))
+
+                # walk back from the last page; the pages before it come out in reverse
+                backward, first = self._walk(last.data["previous"], "previous")
+                self.assertEqual(sum(reversed(backward), []) + forward[-1], expected)
+                self.assertIsNone(first.data["previous"])
+
+                # and "next" from a page reached backwards continues where it left off
+                after = self.client.get(first.data["next"]).data["results"]
+                start = len(backward[-1])
+                self.assertEqual([row["id"] for row in after], expected[start:start + 3])
+
+    def test_page_size_is_capped_and_cursor_validated(self):
+        with self.settings(API_MAX_PAGE_SIZE=4):
+            response = self.client.get("/api/core/careers/?page_size=50")
+        self.assertEqual(len(response.data["results"]), 4)
+        self.assertEqual(self.client.get("/api/core/careers/?cursor=not-a-cursor").status_code, 404)
+
+
+class CompiledQuizTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title="Scored")
+        cls.mcq = QuizQuestion.objects.create(
+            quiz=cls.quiz, question_text="Pick", type="mcq", options=["a", "b", "c"], correct_answer="b", weightage=2,
+        )
+        cls.likert = QuizQuestion.objects.create(
+            quiz=cls.quiz, question_text="Rate", type="likert", options=[1, 2, 3, 4, 5], correct_answer="4", weightage=1,
+        )
+        cls.text = QuizQuestion.objects.create(quiz=cls.quiz, question_text="Why", type="text")
+        cls.compiled = CompiledQuiz.for_quiz(cls.quiz.pk)
+
+    def _answers(self, mcq=None, likert=None, text=None):
+        answers = {str(self.mcq.pk): mcq, str(self.likert.pk): likert, str(self.text.pk): text}
+        return {k: v for k, v in answers.items() if v is not None}
+
+    def test_exact_and_distance_credit(self):
+        score = self.compiled.score
+        self.assertEqual(score(self._answers("b", 4)), 100.0)
+        self.assertEqual(score(self._answers("B ", "4")), 100.0)          # option text, case and spacing
+        self.assertEqual(score(self._answers("1", 4)), 100.0)             # option index
+        self.assertEqual(score(self._answers({"id": "b"}, 4)), 100.0)     # option object
+        # likert 2 against key 4 on a 1..5 scale: half credit on weight 1 of 3
+        self.assertEqual(score(self._answers("b", 2)), round((2 + 0.5) / 3 * 100, 2))
+        self.assertEqual(score(self._answers("a", 1)), round(0.25 / 3 * 100, 2))
+        self.assertEqual(score(self._answers("a")), 0.0)
+        self.assertEqual(score(self._answers("zzz", text="anything")), 0.0)  # unknown option, unkeyed text
+
+    def test_unanswered_or_unkeyed_gives_none(self):
+        self.assertIsNone(self.compiled.score({}))
+        self.assertIsNone(self.compiled.score(None))
+        self.assertIsNone(self.compiled.score({"999999": "b"}))
+        self.assertIsNone(CompiledQuiz.for_quiz(Quiz.objects.create(title="Empty").pk).score({"1": "a"}))
+
+    def test_matrix_and_snapshot_parity(self):
+        attempts = [self._answers("b", 4), self._answers("c", 5), self._answers("a"), self._answers(likert=3)]
+        matrix = self.compiled.score_matrix(np.vstack([self.compiled.encode(a) for a in attempts]))
+        self.assertEqual(matrix.tolist(), [self.compiled.score(a) for a in attempts])
+
+        snapshot = CompiledQuiz.from_dicts(
+            QuizQuestion.objects.filter(quiz=self.quiz).order_by("id")
+            .values("id", "question_text", "type", "options", "correct_answer", "weightage")
+        )
+        self.assertEqual([snapshot.score(a) for a in attempts], [self.compiled.score(a) for a in attempts])
+
+
+class CohortCubeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="cohort", email="c@example.com", password="x", role="student")
+        self.user.profile.education_level = "bachelors"
+        self.user.profile.save()
+        self.quiz = Quiz.objects.create(title="Cohorts")
+        self.question = QuizQuestion.objects.create(quiz=self.quiz, question_text="Pick", options=["a", "b", "c"])
+
+    def _attempt(self, option):
+        attempt = QuizAttempt.objects.create(
+            user=self.user, quiz=self.quiz, answers={str(self.question.pk): option}, completed_at=timezone.now(),
+        )
+        attempt.sync_answer_rows()
+        return attempt
+
+    def _cube(self):
+        return {
+            (s.option, s.role, s.education_level): s.count
+            for s in CohortAnswerStat.objects.filter(question=self.question) if s.count
+        }
+
+    def test_fold_resubmit_and_delete_round_trip(self):
+        attempt = self._attempt("a")
+        self._attempt("a")
+        _silent("rollup_quiz_cohorts")
+        self.assertEqual(self._cube(), {("a", "student", "bachelors"): 2})
+
+        # a profile change after submission must not move the retraction to another cell
+        self.user.role = "graduate"
+        self.user.save()
+        attempt.answers = {str(self.question.pk): ["b", "c"]}
+        attempt.save()
+        attempt.sync_answer_rows()
+        self.assertEqual(self._cube(), {("a", "student", "bachelors"): 1})
+        _silent("rollup_quiz_cohorts")
+        self.assertEqual(self._cube(), {
+            ("a", "student", "bachelors"): 1, ("b", "graduate", "bachelors"): 1, ("c", "graduate", "bachelors"): 1,
+        })
+
+        attempt.delete()
+        self.assertEqual(self._cube(), {("a", "student", "bachelors"): 1})
+        QuizAttempt.objects.all().delete()
+        self.assertEqual(self._cube(), {})
+
+    def test_unfolded_rows_are_not_retracted(self):
+        _silent("rollup_quiz_cohorts")
+        folded = self._attempt("a")
+        _silent("rollup_quiz_cohorts")
+        pending = self._attempt("a")  # past the watermark: never added, so never subtracted
+        retract_attempt(pending)
+        self.assertEqual(self._cube(), {("a", "student", "bachelors"): 1})
+        retract_attempt(folded)
+        self.assertEqual(self._cube(), {})
+
+    def test_backfill_rebuild_does_not_double_count(self):
+        self._attempt("a")
+        self._attempt("b")
+        _silent("rollup_quiz_cohorts")
+        before = self._cube()
+
+        _silent("backfill_quiz_answers", "--rebuild")
+        self.assertEqual(QuizAnswer.objects.count(), 2)
+        self.assertEqual(self._cube(), {})
+        _silent("rollup_quiz_cohorts")
+        self.assertEqual(self._cube(), before)
+
+        # the rebuilt rows are retractable like the originals
+        QuizAttempt.objects.all().delete()
+        self.assertEqual(self._cube(), {})
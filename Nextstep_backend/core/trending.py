@@ -0,0 +1,259 @@
+# core/trending.py
+"""
+Sliding-window counters for "what is hot right now".
+
+Each content object gets a ring buffer of hourly buckets. Interactions are
+folded in as they are created (see core.signals), and top-N queries walk the
+rings of one content type with a bounded heap, so no database work is done per
+request. Counters live in process memory. Every TRENDING_SNAPSHOT_SECONDS a
+timer thread (never the request that recorded the interaction) merges the
+worker's counts since its last snapshot into the shared snapshot in the Django
+cache (under a lock, so workers add to each other's counts instead of
+overwriting them) and adopts the merged counters. Reads re-load the shared
+snapshot once it is older than the same interval, so a worker that only
+serves /trending/ sees the others' counts too: every worker converges on the
+same totals and a fresh one starts warm.
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+BUCKET_SECONDS = 3600
+NUM_BUCKETS = 24 * 7  # longest supported window: 7 days
+SNAPSHOT_KEY = "trending:snapshot"
+SNAPSHOT_LOCK_KEY = "trending:snapshot:lock"
+
+# How much each interaction type contributes to the trending score
+DEFAULT_WEIGHTS = {
+    "view": 1,
+    "like": 2,
+    "save": 3,
+    "share": 3,
+    "apply": 5,
+    "dismiss": 0,
+}
+
+logger = logging.getLogger(__name__)
+
+_WINDOW_RE = re.compile(r"^(\d+)\s*([hd])$")
+
+
+def parse_window(value, default="24h"):
+    """Turn "6h" / "24h" / "7d" into a number of buckets, or None if invalid or too long."""
+    match = _WINDOW_RE.match((value or default).strip().lower())
+    if not match:
+        return None
+    amount, unit = int(match.group(1)), match.group(2)
+    hours = amount * 24 if unit == "d" else amount
+    if hours < 1 or hours * 3600 > BUCKET_SECONDS * NUM_BUCKETS:
+        return None
+    return hours * 3600 // BUCKET_SECONDS
+
+
+class SlidingWindowCounter:
+    """
+    Per-object ring buffers of `num_buckets` time buckets.
+    A slot also remembers which absolute bucket it holds, so stale slots are
+    recognised (and recycled) without any background sweeping.
+    """
+
+    def __init__(self, bucket_seconds=BUCKET_SECONDS, num_buckets=NUM_BUCKETS):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self._rings = {}  # {content_type: {object_id: [counts, epochs]}}
+        self._lock = threading.Lock()
+
+    def _bucket(self, ts):
+        return int(ts // self.bucket_seconds)
+
+    def add(self, content_type, object_id, amount=1, ts=None):
+        if not amount:
+            return
+        epoch = self._bucket(time.time() if ts is None else ts)
+        slot = epoch % self.num_buckets
+        with self._lock:
+            objects = self._rings.setdefault(content_type, {})
+            ring = objects.get(object_id)
+            if ring is None:
+                ring = objects[object_id] = [[0] * self.num_buckets, [-1] * self.num_buckets]
+            counts, epochs = ring
+            if epochs[slot] != epoch:
+                epochs[slot] = epoch
+                counts[slot] = 0
+            counts[slot] += amount
+
+    def _window_total(self, ring, first_epoch):
+        counts, epochs = ring
+        return sum(c for c, e in zip(counts, epochs) if e >= first_epoch)
+
+    def total(self, content_type, object_id, window_buckets, now=None):
+        first_epoch = self._bucket(time.time() if now is None else now) - window_buckets + 1
+        with self._lock:
+            ring = self._rings.get(content_type, {}).get(object_id)
+            return self._window_total(ring, first_epoch) if ring else 0
+
+    def top(self, content_type, window_buckets, limit=10, now=None):
+        """Return [(object_id, score), ...] for the `limit` highest scores in the window."""
+        first_epoch = self._bucket(time.time() if now is None else now) - window_buckets + 1
+        with self._lock:
+            objects = list(self._rings.get(content_type, {}).items())
+        scored = ((self._window_total(ring, first_epoch), object_id) for object_id, ring in objects)
+        best = heapq.nlargest(limit, (item for item in scored if item[0] > 0))
+        return [(object_id, score) for score, object_id in best]
+
+    def prune(self, now=None):
+        """Drop objects whose rings hold nothing inside the longest window."""
+        first_epoch = self._bucket(time.time() if now is None else now) - self.num_buckets + 1
+        with self._lock:
+            for objects in self._rings.values():
+                for object_id in [oid for oid, ring in objects.items() if max(ring[1]) < first_epoch]:
+                    del objects[object_id]
+
+    def _state(self, rings):
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "num_buckets": self.num_buckets,
+            "rings": {
+                ct: {oid: [list(r[0]), list(r[1])] for oid, r in objects.items()}
+                for ct, objects in rings.items()
+            },
+        }
+
+    def dump(self):
+        with self._lock:
+            return self._state(self._rings)
+
+    def _compatible(self, state):
+        return bool(state) and state.get("bucket_seconds") == self.bucket_seconds and state.get("num_buckets") == self.num_buckets
+
+    def load(self, state):
+        if not self._compatible(state):
+            return False
+        with self._lock:
+            self._rings = state["rings"]
+        return True
+
+    def merge(self, state):
+        """Add another counter's dump() onto this one, bucket by bucket."""
+        if not self._compatible(state):
+            return False
+        with self._lock:
+            for ct, objects in state["rings"].items():
+                mine = self._rings.setdefault(ct, {})
+                for object_id, (counts, epochs) in objects.items():
+                    ring = mine.get(object_id)
+                    if ring is None:
+                        mine[object_id] = [list(counts), list(epochs)]
+                        continue
+                    for slot, (n, epoch) in enumerate(zip(counts, epochs)):
+                        if epoch > ring[1][slot]:
+                            ring[0][slot], ring[1][slot] = n, epoch
+                        elif epoch == ring[1][slot]:
+                            ring[0][slot] += n
+        return True
+
+    def take(self):
+        """dump() and reset in one step, so no add() can fall between the two."""
+        with self._lock:
+            rings, self._rings = self._rings, {}
+        # nothing else holds a reference to the old rings any more
+        return self._state(rings)
+
+
+class TrendingTracker:
+    """Process-wide counter plus the snapshot/restore policy around it."""
+
+    def __init__(self):
+        self.counter = SlidingWindowCounter()
+        # recorded here but not merged into the shared snapshot yet
+        self._unsaved = SlidingWindowCounter()
+        self._last_loaded = None  # when the shared snapshot was last adopted
+        self._last_snapshot = time.time()
+        self._timer = None
+        self._timer_lock = threading.Lock()
+
+    @property
+    def weights(self):
+        return getattr(settings, "TRENDING_WEIGHTS", DEFAULT_WEIGHTS)
+
+    @property
+    def snapshot_interval(self):
+        return getattr(settings, "TRENDING_SNAPSHOT_SECONDS", 60)
+
+    def _adopt(self, shared):
+        # counts recorded here but not merged into the shared state yet
+        shared.merge(self._unsaved.dump())
+        self.counter.load(shared.dump())
+        self._last_loaded = time.time()
+
+    def _refresh(self):
+        """Adopt the shared snapshot if ours is older than snapshot_interval; keeps local counts on failure."""
+        if self._last_loaded is not None and time.time() - self._last_loaded < self.snapshot_interval:
+            return
+        self._last_loaded = time.time()
+        shared = SlidingWindowCounter(self.counter.bucket_seconds, self.counter.num_buckets)
+        try:
+            state = cache.get(SNAPSHOT_KEY)
+        except Exception:
+            logger.exception("Could not read the trending snapshot; serving local counts")
+            return
+        if shared.load(state):
+            self._adopt(shared)
+
+    def record(self, content_type, object_id, interaction_type, ts=None):
+        amount = self.weights.get(interaction_type, 1)
+        self.counter.add(content_type, object_id, amount, ts=ts)
+        self._unsaved.add(content_type, object_id, amount, ts=ts)
+        self._schedule()
+
+    def _schedule(self):
+        with self._timer_lock:
+            if self._timer is None:
+                delay = max(0.0, self._last_snapshot + self.snapshot_interval - time.time())
+                self._timer = threading.Timer(delay, self._snapshot_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _snapshot_from_timer(self):
+        with self._timer_lock:
+            self._timer = None
+        try:
+            saved = self.snapshot()
+        except Exception:
+            logger.exception("Trending snapshot failed; retrying in %ss", self.snapshot_interval)
+            saved = False
+        if not saved:
+            # the cache was busy or failing; the counts are still in _unsaved
+            self._schedule()
+
+    def snapshot(self):
+        """Merge this worker's new counts into the shared snapshot and adopt the result."""
+        self._last_snapshot = time.time()
+        if not cache.add(SNAPSHOT_LOCK_KEY, 1, timeout=30):
+            return False  # another worker is merging; ours go with the next snapshot
+        delta = self._unsaved.take()
+        try:
+            shared = SlidingWindowCounter(self.counter.bucket_seconds, self.counter.num_buckets)
+            shared.load(cache.get(SNAPSHOT_KEY))
+            shared.merge(delta)
+            shared.prune()
+            cache.set(SNAPSHOT_KEY, shared.dump(), timeout=None)
+        except Exception:
+            self._unsaved.merge(delta)
+            raise
+        finally:
+            cache.delete(SNAPSHOT_LOCK_KEY)
+        self._adopt(shared)
+        return True
+
+    def top(self, content_type, window_buckets, limit=10):
+        self._refresh()
+        return self.counter.top(content_type, window_buckets, limit)
+
+
+tracker = TrendingTracker()
@@ -13,10 +13,15 @@ router.register(r"success-stories", views.SuccessStoryViewSet, basename="success
 router.register(r"feedback", views.FeedbackViewSet, basename="feedback")
 router.register(r"quizzes", views.QuizViewSet, basename="quiz")
 router.register(r"quiz-questions", views.QuizQuestionViewSet, basename="quizquestion")
+router.register(r"quiz-snapshots", views.QuizSnapshotViewSet, basename="quizsnapshot")
 router.register(r"quiz-attempts", views.QuizAttemptViewSet, basename="quizattempt")
 router.register(r"interactions", views.InteractionViewSet, basename="interaction")
+router.register(r"analytics", views.InteractionStatViewSet, basename="analytics")
+router.register(r"recommendations", views.RecommendationViewSet, basename="recommendation")
+router.register(r"cohorts", views.CohortStatViewSet, basename="cohort")
 # profile is a single endpoint
 urlpatterns = [
     path("", include(router.urls)),
     path("profile/", views.UserProfileView.as_view(), name="user-profile"),
+    path("trending/", views.TrendingView.as_view(), name="trending"),
 ]
@@ -0,0 +1,153 @@
+# core/values_serializer.py
+"""
+Read-only fast path for list endpoints.
+
+compile_plan() looks at a (possibly sparse) ModelSerializer instance once per
+request and turns each readable field into a plain converter over values()
+rows:
+
+    plain model fields          -> the column value as is
+    DateTime / Date / Decimal   -> the DRF field's own to_representation
+                                   (ISO datetimes with the timezone resolved once)
+    File / Image                -> storage URL, absolute when there is a request
+    PrimaryKeyRelatedField(many) -> id list from one join query per relation, in the
+                                   related manager's order (the target's Meta.ordering)
+    StringRelatedField          -> str() of the related rows, one in_bulk() per relation
+
+The output is the same dicts, keys and values the serializer would produce,
+without building model instances or running DRF's per-field attribute lookups.
+Serializers with anything else (method fields, nested serializers, dotted
+sources) get no plan and the caller falls back to the regular path.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+from rest_framework.settings import ISO_8601, api_settings
+
+# DRF fields whose to_representation() returns a model column's value unchanged
+_PLAIN = (
+    serializers.CharField, serializers.ChoiceField, serializers.IntegerField, serializers.FloatField,
+    serializers.BooleanField, serializers.JSONField, serializers.ReadOnlyField,
+)
+_CONVERTED = (serializers.DateTimeField, serializers.DateField, serializers.TimeField, serializers.DecimalField)
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation, minus the per-value format and timezone lookups."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    return convert
+
+
+class ValuesPlan:
+    def __init__(self):
+        self.columns = ["id"]
+        self.steps = []          # (output name, kind, column, extra)
+
+    def _column(self, attname):
+        if attname not in self.columns:
+            self.columns.append(attname)
+        return attname
+
+    def add(self, name, kind, column=None, extra=None):
+        self.steps.append((name, kind, column and self._column(column), extra))
+
+    def render(self, rows, request=None):
+        """Serialize a list of values() rows that include self.columns."""
+        rows = list(rows)
+        pks = [row["id"] for row in rows]
+        lookups = {}
+        for name, kind, column, extra in self.steps:
+            if kind == "m2m":
+                # query the target like the related manager does, so its default ordering applies
+                target, query_name = extra
+                links = {}
+                related = target._default_manager.filter(**{f"{query_name}__in": pks})
+                for other, owner in related.values_list("pk", query_name):
+                    links.setdefault(owner, []).append(other)
+                lookups[name] = links
+            elif kind == "str":
+                ids = {row[column] for row in rows if row[column] is not None}
+                lookups[name] = {pk: str(obj) for pk, obj in extra.objects.in_bulk(ids).items()} if ids else {}
+
+        out = []
+        for row in rows:
+            item = {}
+            for name, kind, column, extra in self.steps:
+                if kind == "m2m":
+                    item[name] = lookups[name].get(row["id"], [])
+                    continue
+                value = row[column]
+                if value is None or kind == "plain":
+                    item[name] = value
+                elif kind == "convert":
+                    item[name] = extra(value)
+                elif kind == "str":
+                    item[name] = lookups[name].get(value)
+                elif not value:  # file
+                    item[name] = None
+                elif extra is None:
+                    item[name] = value
+                else:
+                    url = extra.url(value)
+                    item[name] = request.build_absolute_uri(url) if request is not None else url
+            out.append(item)
+        return out
+
+
+def compile_plan(serializer):
+    """A ValuesPlan for a ModelSerializer instance, or None if some field needs the full path."""
+    meta = getattr(serializer, "Meta", None)
+    if meta is None or not hasattr(meta, "model"):
+        return None
+    model = meta.model
+    opts = model._meta
+    plan = ValuesPlan()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == "*" or "." in source:
+            return None
+        try:
+            model_field = opts.get_field(source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, ManyRelatedField):
+            if not model_field.many_to_many or not model_field.concrete:
+                return None
+            if not isinstance(field.child_relation, serializers.PrimaryKeyRelatedField) or field.child_relation.pk_field:
+                return None
+            plan.add(name, "m2m", extra=(model_field.related_model, model_field.related_query_name()))
+        elif isinstance(field, serializers.StringRelatedField):
+            if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+                return None
+            plan.add(name, "str", model_field.attname, model_field.related_model)
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if not model_field.concrete or field.pk_field:
+                return None
+            plan.add(name, "plain", model_field.attname)
+        elif isinstance(field, serializers.FileField):
+            # use_url=False renders the stored name
+            use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+            plan.add(name, "file", model_field.attname, model_field.storage if use_url else None)
+        elif isinstance(field, serializers.DateTimeField):
+            plan.add(name, "convert", model_field.attname, _datetime_converter(field))
+        elif isinstance(field, _CONVERTED):
+            plan.add(name, "convert", model_field.attname, field.to_representation)
+        elif isinstance(field, _PLAIN) and model_field.concrete and not model_field.is_relation:
+            if isinstance(field, serializers.JSONField) and field.binary:
+                return None
+            plan.add(name, "plain", model_field.attname)
+        else:
+            return None
+    return plan
@@ -0,0 +1,70 @@
+# core/versions.py
+"""
+Per-model change counters for the catalog.
+
+Every model in VERSIONED_MODELS has a version token and a last-modified time
+in the cache. Saving or deleting a row, or changing one of its M2M links,
+replaces them (see core.signals); bulk writers that skip signals call
+bump_model_versions() themselves. Reading the current versions costs one
+cache get_many and no query, which is what makes conditional GETs cheap.
+
+A cold cache starts every model at "now", so the first validators handed out
+after a restart are simply newer than anything a client holds. Versions are
+only trustworthy when every process shares the cache: with a per-process
+backend (locmem, dummy) the bumps made by importers and other workers never
+arrive, so shared_cache() is False and views hand out no validators. Buffered view
+counters (core.counters) do not bump versions: a stale views_count is an
+acceptable difference under a weak ETag.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .models import Career, Multimedia, Quiz, QuizQuestion, Resource, Skill, SuccessStory, Tag
+
+VERSIONED_MODELS = (Tag, Skill, Career, Resource, Multimedia, SuccessStory, Quiz, QuizQuestion)
+VERSION_KEY = "model-version:{label}"
+
+
+def shared_cache():
+    """Whether version bumps made in other processes reach this one."""
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def _key(model):
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def model_versions(*models):
+    """{model: (version, last_modified unix time)} for the given models."""
+    keys = {_key(m): m for m in models}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, model in keys.items():
+        entry = found.get(key)
+        if entry is None:
+            now = time.time_ns()
+            cache.add(key, (now, now / 1e9), timeout=None)
+            entry = cache.get(key) or (now, now / 1e9)
+        versions[model] = entry
+    return versions
+
+
+def bump_model_versions(*models):
+    """Mark `models` as changed once the current transaction commits."""
+    def bump():
+        now = time.time_ns()
+        cache.set_many({_key(m): (now, now / 1e9) for m in models}, timeout=None)
+    transaction.on_commit(bump)
+
+
+def validators(models, vary=""):
+    """(weak ETag, last-modified unix time) covering every model in `models`."""
+    versions = model_versions(*models)
+    token = ":".join(f"{m._meta.label_lower}={versions[m][0]}" for m in models) + "|" + vary
+    etag = 'W/"%s"' % hashlib.sha1(token.encode("utf-8")).hexdigest()[:20]
+    return etag, max(v[1] for v in versions.values())
@@ -1,23 +1,42 @@
 # core/views.py
-from rest_framework import viewsets, generics, permissions, status
+from rest_framework import viewsets, generics, mixins, permissions, status
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Count, Prefetch, Sum
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from datetime import timedelta
 
 from .models import (
     Tag, Skill, Career, Resource, Multimedia,
     SuccessStory, UserProfile, Feedback,
-    Quiz, QuizQuestion, QuizAttempt, Interaction
+    Quiz, QuizQuestion, QuizSnapshot, QuizAttempt, QuizAnswer, Interaction,
+    InteractionDailyStat, ItemNeighbor, UserRecommendation, CohortAnswerStat
 )
+from .trending import tracker, parse_window
+from .counters import view_counter
+from .pagination import KeysetPagination
+from .scoring import compiled_for
+from .adaptive import model_for_quiz
+from .answer_mapping import index_for_quiz, score_answers
+from .values_serializer import compile_plan
+from .versions import shared_cache, validators
+from .response_cache import cache_seconds, get_or_build, response_key
+from .quiz_cache import get_quiz_payload, random_quiz_id, current_snapshot_id
 from .serializers import (
     TagSerializer, SkillSerializer, CareerSerializer, ResourceSerializer,
-    MultimediaSerializer, SuccessStorySerializer, UserProfileSerializer,
-    FeedbackSerializer, QuizSerializer, QuizQuestionSerializer,
-    QuizAttemptSerializer, InteractionSerializer
+    MultimediaSerializer, MultimediaRatingSerializer, SuccessStorySerializer, UserProfileSerializer,
+    FeedbackSerializer, QuizSerializer, QuizQuestionSerializer, QuizSnapshotSerializer,
+    QuizAttemptSerializer, InteractionSerializer,
+    InteractionDailyStatSerializer, ItemNeighborSerializer, UserRecommendationSerializer,
+    CohortAnswerStatSerializer
 )
 
 # Permissions
@@ -37,31 +56,222 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return request.user and request.user.is_staff
         return owner == request.user or request.user.is_staff
 
+def _content_type_from_param(value):
+    """Resolve a ?type= model name such as "career" to a core ContentType (None if unknown)."""
+    if not value:
+        return None
+    try:
+        return ContentType.objects.get_by_natural_key("core", value.lower())
+    except ContentType.DoesNotExist:
+        return None
+
+def _int_param(request, name, default, lo, hi):
+    try:
+        value = int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(lo, min(hi, value))
+
+class CountViewsMixin:
+    """
+    Count a view on every retrieve without writing in the request: the increment is
+    buffered in core.counters and flushed as an atomic `views_count = views_count + n`.
+    The id comes from the URL, so cached and 304 responses (ResponseCacheMixin) are
+    counted without loading the object; the views_count they show may lag the real
+    one by up to RESPONSE_CACHE_SECONDS.
+    """
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            model = self.queryset.model
+            try:
+                pk = model._meta.pk.to_python(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+            except (KeyError, ValidationError):
+                return response
+            view_counter.incr(model, pk)
+        return response
+
+class ProjectedQuerysetMixin:
+    """
+    Load only what the serializer will render. On reads the queryset defers the
+    model columns the (sparse) serializer does not use, and the relations listed in
+    prefetch_fields / select_fields are only joined or prefetched when requested,
+    so ?fields=id,title never reads content_text or touches the tag tables.
+    Ordering fields are always loaded because the keyset paginator reads them.
+    """
+    prefetch_fields = ()
+    select_fields = ()
+
+    def get_read_serializer(self):
+        """The (sparse) serializer for this read request, built once."""
+        if getattr(self, "_read_serializer", None) is None:
+            self._read_serializer = self.get_serializer()
+        return self._read_serializer
+
+    def ordering_names(self, model):
+        return {o.lstrip("-") for o in model._meta.ordering} | set(getattr(self, "ordering_fields", None) or ())
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request is None or self.request.method not in permissions.SAFE_METHODS:
+            return qs.select_related(*self.select_fields).prefetch_related(*self.prefetch_fields)
+        sources = {f.source.split(".")[0] for f in self.get_read_serializer().fields.values() if f.source != "*"}
+        keep = sources | self.ordering_names(qs.model)
+        deferred = [f.name for f in qs.model._meta.concrete_fields if not f.primary_key and f.name not in keep]
+        if deferred:
+            qs = qs.defer(*deferred)
+        qs = qs.select_related(*[n for n in self.select_fields if n in sources])
+        return qs.prefetch_related(*[n for n in self.prefetch_fields if n in sources])
+
+class ValuesListMixin(ProjectedQuerysetMixin):
+    """
+    GET list served from values() rows through a plan compiled from the serializer
+    (core.values_serializer): no model instances, one query per M2M / user relation,
+    same JSON. Serializers the plan cannot express use the regular list().
+    """
+    def list(self, request, *args, **kwargs):
+        plan = compile_plan(self.get_read_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        model = queryset.model
+        # the keyset paginator reads the ordering column of each row
+        columns = list(plan.columns)
+        for name in self.ordering_names(model):
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and field.attname not in columns:
+                columns.append(field.attname)
+        rows = queryset.values(*columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page, request))
+        return Response(plan.render(rows, request))
+
+class ConditionalGetMixin:
+    """
+    Weak ETag / Last-Modified on list and retrieve, taken from the change counters
+    of `version_models` (core.versions): one cache read, no query. A matching
+    If-None-Match (or, without one, If-Modified-Since) on a list or plain retrieve
+    is answered 304 right after the permission checks.
+    Nothing is sent when the cache is per-process, since the counters could be stale.
+    """
+    version_models = ()
+
+    def _validators(self, request):
+        if getattr(self, "_conditional", None) is None:
+            self._conditional = validators(self.version_models, vary=request.headers.get("Accept", ""))
+        return self._conditional
+
+    def _not_modified(self, request):
+        etag, last_modified = self._validators(request)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return "*" in etags or etag.removeprefix("W/") in {e.removeprefix("W/") for e in etags}
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+        return since is not None and int(last_modified) <= since
+
+    def _conditional_applies(self, request):
+        return bool(self.version_models) and request.method in ("GET", "HEAD") and shared_cache()
+
+    def list(self, request, *args, **kwargs):
+        if self._conditional_applies(request) and self._not_modified(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self._conditional_applies(request) and self._not_modified(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().retrieve(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            self._conditional_applies(request)
+            and getattr(self, "action", None) in ("list", "retrieve")
+            and response.status_code in (200, 304)
+            and not response.has_header("ETag")
+        ):
+            etag, last_modified = self._validators(request)
+            if response.status_code == 200 and self._not_modified(request):
+                response.status_code, response.data = 304, None
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(int(last_modified))
+            response["Cache-Control"] = "no-cache"
+        return response
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """
+    Conditional GET plus a server-side copy of the 200 list / retrieve payload
+    (core.response_cache), keyed on the request and the same change counters
+    as the ETag, so any write to `version_models` retires it. Buffered view
+    counts are not writes, so views_count in a cached payload can lag.
+    """
+    def _cached(self, handler, request, *args, **kwargs):
+        if not self._conditional_applies(request) or cache_seconds() <= 0 or self._not_modified(request):
+            return handler(request, *args, **kwargs)
+        etag, _ = self._validators(request)
+        built = {}
+
+        def build():
+            built["response"] = response = handler(request, *args, **kwargs)
+            return response.data, response.status_code == 200
+
+        data, hit = get_or_build(response_key(request, etag), build)
+        response = built.get("response") or Response(data)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+def _etag_response(request, entry):
+    """Serve a cached payload with its strong ETag, or a bare 304 if the client already has it."""
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    if entry["etag"] in etags or "*" in etags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry["data"])
+    response["ETag"] = entry["etag"]
+    response["Cache-Control"] = "no-cache"
+    return response
+
 # Simple CRUD viewsets
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
+    version_models = (Tag,)
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["name", "slug"]
     ordering_fields = ["name", "id"]
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
+    version_models = (Skill,)
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["name"]
     ordering_fields = ["name", "id"]
 
-class CareerViewSet(viewsets.ModelViewSet):
-    queryset = Career.objects.all().prefetch_related("tags","required_skills")
+class CareerViewSet(ResponseCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Career.objects.all()
+    version_models = (Career,)
+    prefetch_fields = ("tags", "required_skills")
     serializer_class = CareerSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["domain", "tags", "required_skills"]
     search_fields = ["title", "description", "domain"]
     ordering_fields = ["created_at","popularity","expected_salary"]
+    pagination_class = KeysetPagination
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAdminUser])
     def build_content_text(self, request, pk=None):
@@ -71,14 +281,18 @@ class CareerViewSet(viewsets.ModelViewSet):
         obj.save(update_fields=["content_text"])
         return Response({"detail": "content_text rebuilt", "content_text": obj.content_text})
 
-class ResourceViewSet(viewsets.ModelViewSet):
-    queryset = Resource.objects.all().prefetch_related("tags")
+class ResourceViewSet(CountViewsMixin, ResponseCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Resource.objects.all()
+    version_models = (Resource,)
+    prefetch_fields = ("tags",)
+    select_fields = ("created_by",)
     serializer_class = ResourceSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["category","tags"]
     search_fields = ["title","description"]
     ordering_fields = ["created_at","views_count"]
+    pagination_class = KeysetPagination
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -90,14 +304,18 @@ class ResourceViewSet(viewsets.ModelViewSet):
         obj.save(update_fields=["content_text"])
         return Response({"detail":"content_text rebuilt","content_text":obj.content_text})
 
-class MultimediaViewSet(viewsets.ModelViewSet):
-    queryset = Multimedia.objects.all().prefetch_related("tags")
+class MultimediaViewSet(CountViewsMixin, ResponseCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = Multimedia.objects.all()
+    version_models = (Multimedia,)
+    prefetch_fields = ("tags",)
+    select_fields = ("created_by",)
     serializer_class = MultimediaSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["type","tags"]
     search_fields = ["title","transcript"]
-    ordering_fields = ["created_at","rating_avg"]
+    ordering_fields = ["created_at","rating_avg","views_count"]
+    pagination_class = KeysetPagination
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -109,13 +327,29 @@ class MultimediaViewSet(viewsets.ModelViewSet):
         obj.save(update_fields=["content_text"])
         return Response({"detail":"content_text rebuilt","content_text":obj.content_text})
 
-class SuccessStoryViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def rate(self, request, pk=None):
+        """Rate this item 1-5; rating again replaces the caller's previous score."""
+        obj = self.get_object()
+        serializer = MultimediaRatingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rating = obj.rate(request.user, serializer.validated_data["score"])
+        return Response({
+            "score": rating.score,
+            "rating_avg": obj.rating_avg,
+            "rating_count": obj.rating_count,
+        })
+
+class SuccessStoryViewSet(CountViewsMixin, ResponseCacheMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = SuccessStory.objects.all()
+    version_models = (SuccessStory,)
+    select_fields = ("submitted_by", "approved_by")
     serializer_class = SuccessStorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["title","story_text","domain"]
-    ordering_fields = ["submitted_at","is_approved"]
+    ordering_fields = ["submitted_at","is_approved","views_count"]
+    pagination_class = KeysetPagination
 
     def perform_create(self, serializer):
         serializer.save(submitted_by=self.request.user)
@@ -144,8 +378,14 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
-        return profile
+        # profiles are created with the user (core.signals); one query for profile + user, one for interests
+        queryset = UserProfile.objects.select_related("user").prefetch_related(Prefetch("interests", queryset=Tag.objects.only("id")))
+        try:
+            return queryset.get(user=self.request.user)
+        except UserProfile.DoesNotExist:
+            # users inserted without signals (bulk loads, raw fixtures)
+            UserProfile.objects.get_or_create(user=self.request.user)
+            return queryset.get(user=self.request.user)
     
     def update(self, request, *args, **kwargs):
         """
@@ -166,6 +406,9 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
                 raw = request.data.getlist('interests')
             except Exception:
                 raw = request.data.get('interests')
+            if isinstance(raw, (list, tuple)) and len(raw) == 1:
+                # a single form value may itself be a JSON list or comma-separated ids
+                raw = raw[0]
 
             if isinstance(raw, (list, tuple)):
                 # list of strings/ints
@@ -188,19 +431,16 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
                     except Exception:
                         interests = None
 
-        serializer = self.get_serializer(instance, data=request.data, partial=partial)
-        serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
-
-        # If we parsed interests, set the many-to-many relationship explicitly
+        data = request.data
         if interests is not None:
-            try:
-                instance.interests.set(interests)
-            except Exception:
-                # swallow individual errors to avoid breaking update — serializer validation should have caught bad ids
-                pass
+            # hand the normalized ids to the serializer, which validates and sets them
+            data = {key: request.data.get(key) for key in request.data}
+            data['interests'] = interests
 
-        return Response(self.get_serializer(instance).data)
+        serializer = self.get_serializer(instance, data=data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(serializer.data)
 
 class FeedbackViewSet(viewsets.ModelViewSet):
     queryset = Feedback.objects.all().select_related("user","handled_by")
@@ -214,27 +454,88 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class QuizViewSet(viewsets.ModelViewSet):
+class QuizViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     queryset = Quiz.objects.all()
+    # the list embeds questions; retrieve keeps its strong payload ETag
+    version_models = (Quiz, QuizQuestion)
     serializer_class = QuizSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["title","description"]
     ordering_fields = ["created_at"]
 
+    def retrieve(self, request, *args, **kwargs):
+        """Served from the versioned quiz payload cache (core.quiz_cache), with ETag support."""
+        pk = str(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        entry = get_quiz_payload(int(pk)) if pk.isdigit() else None
+        if entry is None:
+            return Response({"detail": "No Quiz matches the given query."}, status=status.HTTP_404_NOT_FOUND)
+        return _etag_response(request, entry)
+
     @action(detail=False, methods=['get'])
     def random(self, request):
         """
-        Returns a single random active quiz.
+        Returns a single random active quiz, picked by selection_weight.
+        Optional ?audience=student|graduate|professional narrows the pool.
+        Uses a cached id index (core.quiz_cache), so no query runs on a warm cache.
         """
-        active_quizzes = Quiz.objects.filter(is_active=True)
-        if not active_quizzes.exists():
+        random_id = random_quiz_id(request.query_params.get('audience'))
+        if random_id is None:
             return Response({"detail": "No active quizzes found."}, status=status.HTTP_404_NOT_FOUND)
-        
-        random_quiz = active_quizzes.order_by('?').first()
-        serializer = self.get_serializer(random_quiz)
-        return Response(serializer.data)
+
+        entry = get_quiz_payload(random_id)
+        if entry is None:
+            return Response({"detail": "No active quizzes found."}, status=status.HTTP_404_NOT_FOUND)
+        return _etag_response(request, entry)
     
+    @action(detail=True, methods=['post'], permission_classes=[permissions.AllowAny])
+    def next_question(self, request, pk=None):
+        """
+        Adaptive mode. POST {"answers": {"<question_id>": "<option>"}} with the answers so far;
+        returns the most informative unanswered question (or done=true) and the
+        current top career candidates. Nothing is stored.
+        """
+        answers = request.data.get('answers') or {}
+        if not isinstance(answers, dict):
+            return Response({"detail": "'answers' must be an object keyed by question id."}, status=status.HTTP_400_BAD_REQUEST)
+        model = model_for_quiz(int(pk)) if str(pk).isdigit() else None
+        if model is None:
+            return Response({"detail": "No Quiz matches the given query."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(model.next_step(answers, top=_int_param(request, 'top', 5, 1, 20)))
+
+    @action(detail=True, methods=['post'], permission_classes=[permissions.AllowAny])
+    def instant_result(self, request, pk=None):
+        """
+        POST {"answers": {"<question_id>": "<option>"}}; returns careers, industries and
+        follow-up resources ranked by the answersMapping rules (core.answer_mapping).
+        Deterministic and query-free on a warm index, so it can be shown while the AI explanation loads.
+        """
+        answers = request.data.get('answers') or {}
+        if not isinstance(answers, dict):
+            return Response({"detail": "'answers' must be an object keyed by question id."}, status=status.HTTP_400_BAD_REQUEST)
+        index = index_for_quiz(int(pk)) if str(pk).isdigit() else None
+        if index is None:
+            return Response({"detail": "No Quiz matches the given query."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(score_answers(index, answers, top=_int_param(request, 'top', 5, 1, 50)))
+
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def answer_distribution(self, request, pk=None):
+        """Admin-only: option counts for every question of this quiz in one grouped query."""
+        quiz = self.get_object()
+        rows = (
+            QuizAnswer.objects.filter(question__quiz=quiz)
+            .values("question_id", "option")
+            .annotate(count=Count("id"))
+            .order_by("question_id", "-count", "option")
+        )
+        questions = {}
+        for row in rows:
+            questions.setdefault(row["question_id"], []).append({"option": row["option"], "count": row["count"]})
+        return Response({
+            "quiz": quiz.pk,
+            "questions": [{"question": qid, "distribution": dist} for qid, dist in questions.items()],
+        })
+
     @action(detail=False, methods=['get'])
     def get_by_id(self, request):
         """
@@ -249,33 +550,93 @@ class QuizViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            # Filter by the ID from the query parameters and ensure it's active
-            quiz = Quiz.objects.get(pk=quiz_id, is_active=True)
-        except Quiz.DoesNotExist:
+        if not str(quiz_id).isdigit():
+            return Response(
+                {"detail": f"No active quiz found with ID: {quiz_id}."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Served from the payload cache; inactive quizzes are treated as missing
+        entry = get_quiz_payload(int(quiz_id))
+        if entry is None or not entry["is_active"]:
             # If the quiz is not found by ID or is not active
             return Response(
                 {"detail": f"No active quiz found with ID: {quiz_id}."},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        serializer = self.get_serializer(quiz)
-        return Response(serializer.data)
+
+        return _etag_response(request, entry)
 
 
 
-class QuizQuestionViewSet(viewsets.ModelViewSet):
+class QuizQuestionViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     queryset = QuizQuestion.objects.all()
+    version_models = (QuizQuestion,)
     serializer_class = QuizQuestionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def distribution(self, request, pk=None):
+        """Admin-only: how often each option was chosen for this question (indexed GROUP BY on QuizAnswer)."""
+        question = self.get_object()
+        rows = (
+            QuizAnswer.objects.filter(question=question)
+            .values("option")
+            .annotate(count=Count("id"))
+            .order_by("-count", "option")
+        )
+        return Response({"question": question.pk, "distribution": list(rows)})
+
+class QuizSnapshotViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Immutable question sets referenced by QuizAttempt.snapshot.
+    A snapshot never changes, so clients may cache it forever.
+    """
+    queryset = QuizSnapshot.objects.all()
+    serializer_class = QuizSnapshotSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["quiz"]
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 class QuizAttemptViewSet(viewsets.ModelViewSet):
     queryset = QuizAttempt.objects.all()
     serializer_class = QuizAttemptSerializer
     permission_classes = [permissions.IsAuthenticated]  # only authenticated users can attempt
 
+    def _completion_fields(self, serializer):
+        """
+        An attempt is pinned to the quiz's current snapshot once, when it is created
+        (or first updated without one), so later quiz edits never move it. Submitting
+        answers completes the attempt: stamp completed_at (unless the client sent one)
+        and score it server-side against the snapshot it is pinned to.
+        """
+        data, instance = serializer.validated_data, serializer.instance
+        fields = {}
+        snapshot_id = getattr(instance, "snapshot_id", None)
+        quiz = data.get("quiz")
+        if snapshot_id is None or (quiz is not None and quiz.pk != instance.quiz_id):
+            snapshot_id = fields["snapshot_id"] = current_snapshot_id((quiz or instance.quiz).pk)
+        if "answers" not in data:
+            return fields
+        answers = data["answers"]
+        fields["score"] = compiled_for(instance.quiz_id if quiz is None else quiz.pk, snapshot_id).score(answers)
+        if answers:
+            fields["completed_at"] = data.get("completed_at") or getattr(instance, "completed_at", None) or timezone.now()
+        return fields
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        attempt = serializer.save(user=self.request.user, **self._completion_fields(serializer))
+        attempt.sync_answer_rows()
+
+    def perform_update(self, serializer):
+        attempt = serializer.save(**self._completion_fields(serializer))
+        if "answers" in serializer.validated_data:
+            attempt.sync_answer_rows()
 
     def get_queryset(self):
         # users only see their attempts unless staff
@@ -302,3 +663,188 @@ class InteractionViewSet(viewsets.ModelViewSet):
             # fallback: try to resolve by content_type string (not implemented) - simplest: direct save with object_id + content_type set
             # To create generic FK properly from client, send content_type_id
             serializer.save(user=self.request.user)
+
+
+class InteractionStatViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Admin analytics served from the InteractionDailyStat rollup, never from raw Interaction rows.
+    URL: /api/core/analytics/  (+ timeseries/ and top/)
+    Refresh the rollup with `python manage.py rollup_interactions`.
+    """
+    queryset = InteractionDailyStat.objects.all().select_related("content_type")
+    serializer_class = InteractionDailyStatSerializer
+    permission_classes = [permissions.IsAdminUser]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ["day", "content_type", "object_id", "interaction_type"]
+    ordering_fields = ["day", "count"]
+
+    def _window_queryset(self, request):
+        ct = _content_type_from_param(request.query_params.get("type"))
+        if ct is None:
+            return None, None, Response(
+                {"detail": "Query parameter 'type' must name a core model, e.g. ?type=career."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        days = _int_param(request, "days", 30, 1, 366)
+        since = timezone.now().date() - timedelta(days=days - 1)
+        qs = InteractionDailyStat.objects.filter(
+            content_type=ct,
+            interaction_type=request.query_params.get("interaction", "view"),
+            day__gte=since,
+        )
+        return qs, since, None
+
+    @action(detail=False, methods=["get"])
+    def timeseries(self, request):
+        """
+        Daily counts for one object (?object_id=) or a whole content type.
+        e.g. /analytics/timeseries/?type=career&object_id=5&interaction=view&days=30
+        """
+        qs, since, error = self._window_queryset(request)
+        if error:
+            return error
+        object_id = request.query_params.get("object_id")
+        if object_id:
+            if not object_id.isdigit():
+                return Response({"detail": "Query parameter 'object_id' must be numeric."}, status=status.HTTP_400_BAD_REQUEST)
+            qs = qs.filter(object_id=int(object_id))
+
+        totals = {
+            row["day"]: row["total"]
+            for row in qs.values("day").annotate(total=Sum("count")).order_by()
+        }
+        today = timezone.now().date()
+        series = []
+        day = since
+        while day <= today:
+            series.append({"day": day, "count": totals.get(day, 0)})
+            day += timedelta(days=1)
+        return Response({"since": since, "series": series})
+
+    @action(detail=False, methods=["get"])
+    def top(self, request):
+        """
+        Top-N objects of a content type by interaction count over the window.
+        e.g. /analytics/top/?type=career&interaction=view&days=30&limit=10
+        """
+        qs, since, error = self._window_queryset(request)
+        if error:
+            return error
+        limit = _int_param(request, "limit", 10, 1, 100)
+        rows = (
+            qs.values("object_id")
+            .annotate(total=Sum("count"))
+            .order_by("-total", "object_id")[:limit]
+        )
+        return Response({
+            "since": since,
+            "results": [{"object_id": r["object_id"], "count": r["total"]} for r in rows],
+        })
+
+
+class TrendingView(generics.GenericAPIView):
+    """
+    Top-N trending objects of one content type, answered from in-memory sliding-window counters.
+    URL: /api/core/trending/?type=career&window=24h&limit=10
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        ct = _content_type_from_param(request.query_params.get("type"))
+        if ct is None:
+            return Response(
+                {"detail": "Query parameter 'type' must name a core model, e.g. ?type=career."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        window = request.query_params.get("window", "24h")
+        buckets = parse_window(window)
+        if buckets is None:
+            return Response(
+                {"detail": "Query parameter 'window' must look like 6h, 24h or 7d (max 7d)."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = _int_param(request, "limit", 10, 1, 100)
+        results = [
+            {"object_id": object_id, "score": score}
+            for object_id, score in tracker.top(ct.model, buckets, limit)
+        ]
+        return Response({"type": ct.model, "window": window, "results": results})
+
+
+class RecommendationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Collaborative-filtering picks precomputed by `python manage.py train_recommender`.
+    URL: /api/core/recommendations/            -> the current user's recommendations
+         /api/core/recommendations/similar/?type=career&id=5  -> "users who saved this also saved"
+    Both are a single indexed lookup.
+    """
+    serializer_class = UserRecommendationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        limit = _int_param(self.request, "limit", 20, 1, 100)
+        return (
+            UserRecommendation.objects.filter(user=self.request.user)
+            .select_related("content_type")
+            .order_by("rank")[:limit]
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.AllowAny])
+    def similar(self, request):
+        ct = _content_type_from_param(request.query_params.get("type"))
+        object_id = request.query_params.get("id")
+        if ct is None or not str(object_id or "").isdigit():
+            return Response(
+                {"detail": "Query parameters 'type' (e.g. career) and numeric 'id' are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = _int_param(request, "limit", 10, 1, 100)
+        neighbors = (
+            ItemNeighbor.objects.filter(content_type=ct, object_id=int(object_id))
+            .select_related("neighbor_content_type")
+            .order_by("rank")[:limit]
+        )
+        return Response(ItemNeighborSerializer(neighbors, many=True).data)
+
+
+class CohortStatViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Admin slice/dice over the CohortAnswerStat cube (never touches attempts or answers).
+    URL: /api/core/cohorts/?quiz=1&role=student
+         /api/core/cohorts/slice/?quiz=1&question=4&group_by=role,option&since=2025-01-01
+    Refresh the cube with `python manage.py rollup_quiz_cohorts`.
+    """
+    queryset = CohortAnswerStat.objects.all()
+    serializer_class = CohortAnswerStatSerializer
+    permission_classes = [permissions.IsAdminUser]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ["quiz", "question", "option", "role", "education_level", "week"]
+    ordering_fields = ["week", "count"]
+
+    GROUPABLE = ("quiz", "question", "option", "role", "education_level", "week")
+
+    @action(detail=False, methods=["get"])
+    def slice(self, request):
+        group_by = [g.strip() for g in request.query_params.get("group_by", "option").split(",") if g.strip()]
+        unknown = [g for g in group_by if g not in self.GROUPABLE]
+        if unknown or not group_by:
+            return Response(
+                {"detail": f"group_by must be a comma-separated subset of {', '.join(self.GROUPABLE)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        qs = self.filter_queryset(self.get_queryset()).filter(count__gt=0)
+        bounds = {}
+        for name, lookup in (("since", "week__gte"), ("until", "week__lte")):
+            value = request.query_params.get(name)
+            if not value:
+                continue
+            try:
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                return Response({"detail": f"'{name}' must be a date (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+            bounds[lookup] = day
+        qs = qs.filter(**bounds)
+        rows = qs.values(*group_by).annotate(count=Sum("count")).order_by(*group_by)
+        return Response({"group_by": group_by, "results": list(rows)})
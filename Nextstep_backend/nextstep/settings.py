@@ -93,6 +93,17 @@ REST_FRAMEWORK["DEFAULT_FILTER_BACKENDS"] = [
     "rest_framework.filters.SearchFilter",
     "rest_framework.filters.OrderingFilter",
 ]
+# orjson-backed when installed; same bytes as the stock JSONRenderer
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
+    "core.renderers.FastJSONRenderer",
+    "rest_framework.renderers.BrowsableAPIRenderer",
+]
+# keyset pagination (core.pagination) for the catalog list endpoints only; the other
+# lists keep returning bare arrays. ?page_size= is capped at API_MAX_PAGE_SIZE
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "100"))
+# ?total=1 counts at most this many rows outside PostgreSQL
+API_COUNT_LIMIT = int(os.getenv("API_COUNT_LIMIT", "10000"))
 
 
 ROOT_URLCONF = 'nextstep.urls'
@@ -198,6 +209,37 @@ JAZZMIN_SETTINGS ={
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Seed catalog shared with the frontend (quiz answersMapping, career bank, ...)
+CAREER_DATA_FILE = os.getenv('CAREER_DATA_FILE', os.path.normpath(os.path.join(BASE_DIR, '..', 'Nextstep-frontend', 'nextstep-navigator', 'src', 'data', 'careerData.json')))
+
+# Shared cache for quiz payloads, model versions and cached API responses.
+# CACHE_BACKEND=file (CACHE_LOCATION directory, the default), redis (CACHE_LOCATION url, needs the
+# redis package) or locmem. locmem is per process: importers and other workers cannot invalidate it,
+# so ETags and the response cache are switched off with it.
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'nextstep'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.path.join(BASE_DIR, 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+_cache_backend, _cache_location = _CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'file')]
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': os.getenv('CACHE_LOCATION', _cache_location),
+    }
+}
+if not _cache_backend.endswith('RedisCache'):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '5000'))}
+# cached GET responses of the catalog endpoints (core.response_cache); 0 disables, as does locmem
+RESPONSE_CACHE_SECONDS = int(os.getenv('RESPONSE_CACHE_SECONDS', '300'))
+
+# rollup_interactions leaves rows younger than this unfolded, so ids still in flight
+# in an uncommitted transaction are never passed by its id watermark
+INTERACTION_ROLLUP_LAG_SECONDS = int(os.getenv('INTERACTION_ROLLUP_LAG_SECONDS', '300'))
+
+# Cold storage for old Interaction rows (see `python manage.py archive_interactions`)
+INTERACTION_ARCHIVE_DIR = os.getenv('INTERACTION_ARCHIVE_DIR', os.path.join(BASE_DIR, "archive", "interactions"))
+
 # Email Configuration for SendGrid
 # In production, use environment variables for sensitive data like EMAIL_HOST_PASSWORD.
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'